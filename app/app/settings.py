@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -38,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
     'rest_framework',
     'rest_framework.authtoken',
@@ -48,6 +51,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,15 +84,67 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Set DB_POOLER=1 when DB_HOST is a transaction-mode pooler such as
+# PgBouncer. A pooled server connection is only ours for one transaction,
+# so server-side cursors, which Django holds open across transactions, are
+# disabled. psycopg2 does not use server-side prepared statements and the
+# app sets no session state, so nothing else has to change.
+
+DB_POOLER = bool(int(os.environ.get('DB_POOLER', 0)))
+
 DATABASES = {
     'default': {
-        'ENGINE' : 'django.db.backends.postgresql',
+        # django.db.backends.postgresql with lazy CONN_HEALTH_CHECKS.
+        'ENGINE' : 'core.backends.postgresql',
         'HOST' : os.environ.get('DB_HOST'),
+        'PORT' : os.environ.get('DB_PORT', ''),
         'NAME' : os.environ.get('DB_NAME'),
         'USER' : os.environ.get('DB_USER'),
         'PASSWORD' : os.environ.get('DB_PASS'),
+        # Keep connections open between requests; 0 closes them after each
+        # request. Every worker thread holds at most one connection, so the
+        # number of server workers and threads sizes the pool.
+        'CONN_MAX_AGE' : int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        # Check a persistent connection when a request first uses it.
+        'CONN_HEALTH_CHECKS' : bool(int(os.environ.get('DB_CONN_HEALTH_CHECKS', 1))),
+        'DISABLE_SERVER_SIDE_CURSORS' : DB_POOLER,
+        'OPTIONS' : {
+            'connect_timeout' : int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+            # Detect connections dropped by a failover while idle.
+            'keepalives' : 1,
+            'keepalives_idle' : int(os.environ.get('DB_KEEPALIVES_IDLE', 30)),
+            'keepalives_interval' : 10,
+            'keepalives_count' : 3,
+        },
+    }
+}
+
+
+# Read replicas (see core.routers). DB_REPLICA_HOSTS is a comma-separated
+# list of hosts sharing the primary's credentials, added as replica1,
+# replica2, ... A replica alias may point at the primary itself for local
+# testing. Users are pinned to the primary for STICKY_SECONDS after a write,
+# which should exceed the replication lag; use a shared CACHE_BACKEND so
+# the pin is seen by every worker. Run the tests without replicas: a test
+# mirror has its own connection and cannot see a test case's transaction.
 
+REPLICA_HOSTS = [
+    host.strip() for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',')
+    if host.strip()
+]
+for index, host in enumerate(REPLICA_HOSTS, start=1):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'HOST' : host,
+        'TEST' : {'MIRROR' : 'default'},
     }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+REPLICA_ROUTING = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'STICKY_SECONDS': int(os.environ.get('REPLICA_STICKY_SECONDS', 5)),
+    'CACHE_ALIAS': 'default',
 }
 
 
@@ -137,7 +193,193 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# Password hashing policy (see core.hashers). PASSWORD_HASHER picks the
+# algorithm for new hashes; hashes made with another algorithm or other work
+# factors are upgraded on the user's next successful login. Measure the
+# candidates on the host with `manage.py benchmark_hashers`.
+
+PASSWORD_HASHER_POLICY = {
+    'ALGORITHM': os.environ.get('PASSWORD_HASHER', 'pbkdf2_sha256'),
+    'PBKDF2_ITERATIONS': int(os.environ.get('PBKDF2_ITERATIONS', 260000)),
+    'ARGON2_TIME_COST': int(os.environ.get('ARGON2_TIME_COST', 2)),
+    'ARGON2_MEMORY_COST': int(os.environ.get('ARGON2_MEMORY_COST', 102400)),
+    'ARGON2_PARALLELISM': int(os.environ.get('ARGON2_PARALLELISM', 8)),
+    'BCRYPT_ROUNDS': int(os.environ.get('BCRYPT_ROUNDS', 12)),
+    'SCRYPT_WORK_FACTOR': int(os.environ.get('SCRYPT_WORK_FACTOR', 2 ** 14)),
+    'SCRYPT_BLOCK_SIZE': int(os.environ.get('SCRYPT_BLOCK_SIZE', 8)),
+    'SCRYPT_PARALLELISM': int(os.environ.get('SCRYPT_PARALLELISM', 1)),
+}
+
+PASSWORD_HASHER_CLASSES = {
+    'pbkdf2_sha256': 'core.hashers.PBKDF2PasswordHasher',
+    'argon2': 'core.hashers.Argon2PasswordHasher',
+    'bcrypt_sha256': 'core.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'core.hashers.ScryptPasswordHasher',
+}
+
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER_POLICY['ALGORITHM']],
+    *(
+        path for algorithm, path in PASSWORD_HASHER_CLASSES.items()
+        if algorithm != PASSWORD_HASHER_POLICY['ALGORITHM']
+    ),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Password hashing pool (see core.hashing), per server process. WORKERS=0
+# hashes on the request thread. Beyond MAX_PENDING running or queued
+# hashes, login and signup answer 503.
+
+PASSWORD_HASHING = {
+    'WORKERS': int(os.environ.get('PASSWORD_HASHING_WORKERS', 2)),
+    'MAX_PENDING': int(os.environ.get('PASSWORD_HASHING_MAX_PENDING', 8)),
+    'TIMEOUT': float(os.environ.get('PASSWORD_HASHING_TIMEOUT', 10)),
+}
+
+# Request latency metrics (see core.metrics).
+
+METRICS = {
+    'CACHE_ALIAS': 'default',
+}
+
+# Serve read endpoints with async views (see core.async_views). app/asgi.py
+# turns this on; WSGI servers should leave it off. Reads run in a pool of
+# ASYNC_VIEWS_THREADS threads per worker, each holding a database connection
+# while CONN_MAX_AGE allows, plus one thread for writes: keep
+# workers * (ASYNC_VIEWS_THREADS + 1) within the server's max_connections or
+# the PgBouncer DEFAULT_POOL_SIZE.
+
+ASYNC_VIEWS = bool(int(os.environ.get('ASYNC_VIEWS', 0)))
+ASYNC_VIEWS_THREADS = int(os.environ.get('ASYNC_VIEWS_THREADS', 8))
+
+# Precomputed OpenAPI schema (see core.schema). When set, the directory
+# holds the files written by `manage.py generate_schema` at deploy time;
+# otherwise the schema is generated once per process.
+
+API_SCHEMA = {
+    'DIR': os.environ.get('API_SCHEMA_DIR', ''),
+}
+
+# Response compression (see core.middleware.CompressionMiddleware).
+# Content types are matched by prefix.
+
+COMPRESSION = {
+    'MIN_SIZE': int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),
+    'GZIP_LEVEL': int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6)),
+    'BROTLI_QUALITY': int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4)),
+    'CONTENT_TYPES': [
+        'application/json',
+        'application/x-ndjson',
+        'application/vnd.oai.openapi',
+        'application/javascript',
+        'text/',
+    ],
+}
+
+# Caches
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# The default per-process cache only suits a single worker; point
+# CACHE_BACKEND/CACHE_LOCATION at a shared cache (e.g. memcached) in production.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Per-user cache of recipe API responses (see recipe.cache).
+
+RECIPE_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': int(os.environ.get('RECIPE_CACHE_TIMEOUT', 300)),
+}
+
+# Serialize recipe lists with recipe.serializers.RecipeValuesSerializer
+# instead of the DRF field machinery. The output is identical.
+
+RECIPE_FAST_LIST = bool(int(os.environ.get('RECIPE_FAST_LIST', 1)))
+
+# Limits of the recipe bulk endpoint.
+
+RECIPE_BULK = {
+    'MAX_ITEMS': int(os.environ.get('RECIPE_BULK_MAX_ITEMS', 10000)),
+    'BATCH_SIZE': int(os.environ.get('RECIPE_BULK_BATCH_SIZE', 1000)),
+}
+
+# Rows fetched per round trip by the streaming recipe export.
+
+RECIPE_EXPORT_CHUNK_SIZE = int(os.environ.get('RECIPE_EXPORT_CHUNK_SIZE', 2000))
+
+# Cache of token -> user lookups used by core.authentication.
+# Set TOKEN_AUTH_CACHE_ALIAS to a CACHES alias to share it between processes.
+
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_MAX_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 300)),
+    'CACHE_ALIAS': os.environ.get('TOKEN_AUTH_CACHE_ALIAS'),
+}
+
+# Sliding-window login and signup throttles (see core.throttling). Counters
+# are kept per process; set THROTTLE_CACHE_ALIAS to a CACHES alias to
+# enforce the limits across processes.
+
+THROTTLING = {
+    'CACHE_ALIAS': os.environ.get('THROTTLE_CACHE_ALIAS'),
+    'MAX_KEYS': int(os.environ.get('THROTTLE_MAX_KEYS', 100000)),
+}
+
+# Auth tokens expire after IDLE_TIMEOUT seconds without use; 0 disables
+# expiry. Uses are kept in memory and written every FLUSH_INTERVAL seconds
+# (see core.tokens). Delete expired tokens with `manage.py prune_tokens`.
+
+TOKEN_EXPIRY = {
+    'IDLE_TIMEOUT': int(os.environ.get('TOKEN_IDLE_TIMEOUT', 14 * 24 * 60 * 60)),
+    'FLUSH_INTERVAL': int(os.environ.get('TOKEN_FLUSH_INTERVAL', 60)),
+}
+
+# Stateless signed tokens (see core.signed_tokens). When enabled, the token
+# endpoint issues short-lived access tokens, sent as "Authorization: Bearer",
+# and refresh tokens for the token refresh endpoint. TTLs are in seconds.
+# Tokens are signed with SIGNED_TOKEN_SIGNING_KEY, not SECRET_KEY, which is
+# committed above; signed mode refuses to start without it.
+
+SIGNED_TOKENS = {
+    'ENABLED': bool(int(os.environ.get('SIGNED_TOKENS', 0))),
+    'SIGNING_KEY': os.environ.get('SIGNED_TOKEN_SIGNING_KEY'),
+    'ACCESS_TTL': int(os.environ.get('SIGNED_TOKEN_ACCESS_TTL', 5 * 60)),
+    'REFRESH_TTL': int(os.environ.get('SIGNED_TOKEN_REFRESH_TTL', 14 * 24 * 60 * 60)),
+}
+if SIGNED_TOKENS['ENABLED'] and not SIGNED_TOKENS['SIGNING_KEY']:
+    raise ImproperlyConfigured('SIGNED_TOKENS is set but SIGNED_TOKEN_SIGNING_KEY is not.')
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-
-}
\ No newline at end of file
+    # orjson-backed JSON, falling back to the stdlib when orjson is missing.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Cursor pagination of the recipe list (see recipe.pagination).
+    'RECIPE_PAGE_SIZE': int(os.environ.get('RECIPE_PAGE_SIZE', 100)),
+    'RECIPE_MAX_PAGE_SIZE': int(os.environ.get('RECIPE_MAX_PAGE_SIZE', 1000)),
+    # Proxies in front of the app that append to X-Forwarded-For. With 0,
+    # throttles key on REMOTE_ADDR and ignore the client-supplied header.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+    # Rates of core.throttling, as '<throttle_scope>_ip' and '_email'.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('THROTTLE_LOGIN_IP', '60/min'),
+        'login_email': os.environ.get('THROTTLE_LOGIN_EMAIL', '10/min'),
+        'signup_ip': os.environ.get('THROTTLE_SIGNUP_IP', '20/hour'),
+        'signup_email': os.environ.get('THROTTLE_SIGNUP_EMAIL', '5/hour'),
+        'refresh_ip': os.environ.get('THROTTLE_REFRESH_IP', '60/min'),
+    },
+}
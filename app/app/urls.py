@@ -13,21 +13,21 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-)
+from drf_spectacular.views import SpectacularSwaggerView
 
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import MetricsView, PrecomputedSchemaView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/schema', SpectacularAPIView.as_view(), name = 'api-schema'),
+    path('api/schema', PrecomputedSchemaView.as_view(), name = 'api-schema'),
     path('api/docs/',SpectacularSwaggerView.as_view(url_name= "api-schema"), name = 'api-docs'
     ),
     path('api/user/', include('user.urls')),
     path('api/recipe/', include('recipe.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='api-metrics'),
 
 ]
 
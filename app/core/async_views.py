@@ -0,0 +1,98 @@
+"""
+Async read views for ASGI serving.
+
+Under ASGI, Django 3.2 runs every sync view in one shared thread, so a
+worker serves one request at a time. The views returned here run GET and
+HEAD requests in a thread pool of ``ASYNC_VIEWS_THREADS`` threads instead,
+letting a worker wait on the database for many reads at once. Other methods
+keep Django's default, thread-sensitive behaviour. Each pool thread holds
+its own database connection, so the pool size counts against the database
+connection budget.
+"""
+import functools
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+READ_METHODS = ('GET', 'HEAD')
+
+SPOOL_MAX_MEMORY = 2 ** 20
+SPOOL_CHUNK_SIZE = 2 ** 16
+
+_executor = None
+
+
+def get_executor():
+    """Return the process-wide pool that runs read views."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_VIEWS_THREADS, thread_name_prefix='async-read',
+        )
+    return _executor
+
+
+def async_read_view(view):
+    """Return an async version of a sync view if ``ASYNC_VIEWS`` is on."""
+    if not settings.ASYNC_VIEWS:
+        return view
+
+    read = sync_to_async(
+        _in_pool_thread(view), thread_sensitive=False, executor=get_executor(),
+    )
+    write = sync_to_async(view, thread_sensitive=True)
+
+    async def async_view(request, *args, **kwargs):
+        handler = read if request.method in READ_METHODS else write
+        return await handler(request, *args, **kwargs)
+
+    # Keep csrf_exempt, cls and initkwargs for middleware and schema generation.
+    return functools.wraps(view)(async_view)
+
+
+def async_read_urls(urlpatterns):
+    """Make the views of URL patterns, e.g. a router's, async readers."""
+    for pattern in urlpatterns:
+        pattern.callback = async_read_view(pattern.callback)
+
+    return urlpatterns
+
+
+def _in_pool_thread(view):
+    """Wrap a view with the per-request work Django does for its own thread."""
+
+    @functools.wraps(view)
+    def run(request, *args, **kwargs):
+        # request_started/finished only manage the connections of Django's
+        # thread, so do the same for this one.
+        close_old_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            if response.streaming:
+                _spool(response)
+            return response
+        finally:
+            close_old_connections()
+
+    return run
+
+
+def _spool(response):
+    """Produce a streaming response's content here rather than in the event loop.
+
+    Django 3.2 iterates streaming responses inside the event loop, where the
+    database cannot be used. The content goes to a temporary file, kept in
+    memory up to SPOOL_MAX_MEMORY bytes, and is streamed from there.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    for chunk in response.streaming_content:
+        spool.write(chunk)
+    spool.seek(0)
+
+    response.streaming_content = iter(lambda: spool.read(SPOOL_CHUNK_SIZE), b'')
+    response._resource_closers.append(spool.close)
@@ -0,0 +1,120 @@
+"""
+Authentication classes for the API.
+"""
+import pickle
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from core import tokens
+from core.cache import LRUCache
+
+
+class TokenCache:
+    """Cache of token key -> (user, token), bounded in size and age.
+
+    Entries live in a per-process LRU, or in the Django cache named by
+    ``CACHE_ALIAS`` so that invalidations are shared between processes.
+    Values are pickled so every request gets its own model instances.
+    """
+    key_prefix = 'authtoken:'
+
+    def __init__(self, max_size, ttl, cache_alias=None):
+        self.ttl = ttl
+        self.cache_alias = cache_alias
+        self._local = LRUCache(max_size, ttl)
+
+    def get(self, key):
+        """Return the cached (user, token) pair for key, or None."""
+        if self.cache_alias:
+            return caches[self.cache_alias].get(self.key_prefix + key)
+
+        data = self._local.get(key)
+        return pickle.loads(data) if data is not None else None
+
+    def set(self, key, value):
+        """Cache the (user, token) pair for key."""
+        if self.cache_alias:
+            caches[self.cache_alias].set(self.key_prefix + key, value, self.ttl)
+        else:
+            self._local.set(key, pickle.dumps(value))
+
+    def delete(self, key):
+        """Drop key from the cache."""
+        if self.cache_alias:
+            caches[self.cache_alias].delete(self.key_prefix + key)
+        else:
+            self._local.delete(key)
+
+    def clear(self):
+        """Drop every locally cached token."""
+        self._local.clear()
+
+
+_token_cache = None
+
+
+def get_token_cache():
+    """Return the process-wide token cache configured in settings."""
+    global _token_cache
+    if _token_cache is None:
+        config = settings.TOKEN_AUTH_CACHE
+        _token_cache = TokenCache(
+            max_size=config['MAX_SIZE'],
+            ttl=config['TTL'],
+            cache_alias=config.get('CACHE_ALIAS'),
+        )
+    return _token_cache
+
+
+@receiver(setting_changed)
+def reset_token_cache(setting, **kwargs):
+    """Rebuild the token cache when its settings change."""
+    global _token_cache
+    if setting == 'TOKEN_AUTH_CACHE':
+        _token_cache = None
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that avoids a database hit for known tokens.
+
+    Tokens expire after TOKEN_EXPIRY['IDLE_TIMEOUT'] seconds without use.
+    Uses are recorded in memory by core.tokens, so requests stay read-only.
+    """
+
+    def authenticate_credentials(self, key):
+        """Return the cached user and token, falling back to the database."""
+        token_cache = get_token_cache()
+        cached = token_cache.get(key)
+        if cached is not None and not tokens.is_expired(cached[1]):
+            tokens.get_tracker().touch(key)
+            return cached
+
+        # A cached token may look expired only because its last use was
+        # written after it was cached, so check the database before failing.
+        user, token = self._load_credentials(key)
+        if tokens.is_expired(token):
+            token_cache.delete(key)
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+
+        token_cache.set(key, (user, token))
+        tokens.get_tracker().touch(key)
+
+        return (user, token)
+
+    def _load_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user', 'activity').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
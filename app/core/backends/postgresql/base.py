@@ -0,0 +1,42 @@
+"""
+PostgreSQL backend with lazy connection health checks.
+
+With ``CONN_HEALTH_CHECKS``, a persistent connection is checked the first
+time a request uses it, so a connection dropped by a failover or an idle
+timeout is replaced instead of failing the request. Requests that run no
+query, such as cached responses, pay nothing.
+"""
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL connection checked once per request, on first use."""
+    health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return bool(self.settings_dict.get('CONN_HEALTH_CHECKS'))
+
+    def connect(self):
+        super().connect()
+        # A fresh connection needs no check.
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        # Runs on request_started and request_finished.
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        """Close the connection if it no longer answers; the next use reconnects."""
+        if self.connection is None or self.health_check_done or not self.health_check_enabled:
+            return
+
+        # Inside a transaction a lost connection must fail, not be replaced.
+        if not self.in_atomic_block and not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
@@ -0,0 +1,133 @@
+"""
+Password hashers tuned by ``PASSWORD_HASHER_POLICY``.
+
+Each hasher reads its work factors from the policy, so changing the policy
+makes ``must_update()`` true for older hashes and they are upgraded on the
+user's next successful login. Algorithm names match Django's, so hashes
+stay valid if the policy classes are removed.
+"""
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+
+def _policy(name):
+    return settings.PASSWORD_HASHER_POLICY[name]
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PBKDF2_ITERATIONS."""
+
+    @property
+    def iterations(self):
+        return _policy('PBKDF2_ITERATIONS')
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2 with ARGON2_TIME_COST, ARGON2_MEMORY_COST and ARGON2_PARALLELISM."""
+
+    @property
+    def time_cost(self):
+        return _policy('ARGON2_TIME_COST')
+
+    @property
+    def memory_cost(self):
+        return _policy('ARGON2_MEMORY_COST')
+
+    @property
+    def parallelism(self):
+        return _policy('ARGON2_PARALLELISM')
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """bcrypt of SHA256 with BCRYPT_ROUNDS."""
+
+    @property
+    def rounds(self):
+        return _policy('BCRYPT_ROUNDS')
+
+
+class BaseScryptPasswordHasher(hashers.BasePasswordHasher):
+    """scrypt, compatible with the hasher Django adds in 4.0."""
+    algorithm = 'scrypt'
+    block_size = 8
+    parallelism = 1
+    work_factor = 2 ** 14
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+            # OpenSSL's default limit of 32 MiB is too low above n=2**14.
+            maxmem=2 * 128 * n * r * p,
+            dklen=64,
+        )
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return '%s$%d$%s$%d$%d$%s' % (self.algorithm, n, salt, r, p, hash_)
+
+    def decode(self, encoded):
+        algorithm, work_factor, salt, block_size, parallelism, hash_ = encoded.split('$', 6)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'block_size': int(block_size),
+            'hash': hash_,
+            'parallelism': int(parallelism),
+            'salt': salt,
+            'work_factor': int(work_factor),
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password, decoded['salt'], decoded['work_factor'],
+            decoded['block_size'], decoded['parallelism'],
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): decoded['algorithm'],
+            _('work factor'): decoded['work_factor'],
+            _('block size'): decoded['block_size'],
+            _('parallelism'): decoded['parallelism'],
+            _('salt'): hashers.mask_hash(decoded['salt'], show=4),
+            _('hash'): hashers.mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (
+            decoded['work_factor'] != self.work_factor or
+            decoded['block_size'] != self.block_size or
+            decoded['parallelism'] != self.parallelism
+        )
+
+    def harden_runtime(self, password, encoded):
+        # The runtime of scrypt does not depend on the stored parameters.
+        pass
+
+
+class ScryptPasswordHasher(BaseScryptPasswordHasher):
+    """scrypt with SCRYPT_WORK_FACTOR, SCRYPT_BLOCK_SIZE and SCRYPT_PARALLELISM."""
+
+    @property
+    def work_factor(self):
+        return _policy('SCRYPT_WORK_FACTOR')
+
+    @property
+    def block_size(self):
+        return _policy('SCRYPT_BLOCK_SIZE')
+
+    @property
+    def parallelism(self):
+        return _policy('SCRYPT_PARALLELISM')
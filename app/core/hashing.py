@@ -0,0 +1,187 @@
+"""
+Password hashing in a bounded process pool.
+
+PBKDF2 deliberately burns CPU for hundreds of milliseconds. Running it on
+request threads lets a burst of logins or signups occupy every server
+thread, so token login and signup hash in a small pool of processes
+instead. At most ``PASSWORD_HASHING['MAX_PENDING']`` hashes may be running
+or queued per server process; beyond that requests fail fast with 503 and
+a Retry-After header rather than queueing behind each other.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, hashers
+from django.contrib.auth.signals import user_login_failed
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from core import metrics
+
+REJECTED_METRIC = 'hashing_rejected'
+metrics.register_counter(REJECTED_METRIC)
+
+
+class HashingBusy(APIException):
+    """Raised when the hashing pool has no room for another password."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many password checks in progress, try again shortly.'
+    default_code = 'hashing_busy'
+    wait = 1
+
+
+def _init_worker():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    import django
+
+    django.setup()
+
+
+class HashingPool:
+    """Run password hashers in worker processes with a bounded backlog."""
+
+    def __init__(self, workers, max_pending, timeout):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor = None
+
+    def run(self, func, *args):
+        """Return func(*args) computed in the pool, or raise HashingBusy."""
+        if not self.workers:
+            return func(*args)
+
+        if not self._slots.acquire(blocking=False):
+            metrics.increment(REJECTED_METRIC)
+            raise HashingBusy()
+
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            metrics.increment(REJECTED_METRIC)
+            raise HashingBusy()
+
+    def stats(self):
+        """Return the pool size and current backlog."""
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'pending': self._pending,
+        }
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Forking a threaded server process is unsafe.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker,
+                    )
+        return self._executor
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+
+_pool = None
+
+
+def get_pool():
+    """Return the process-wide hashing pool."""
+    global _pool
+    if _pool is None:
+        config = settings.PASSWORD_HASHING
+        _pool = HashingPool(config['WORKERS'], config['MAX_PENDING'], config['TIMEOUT'])
+    return _pool
+
+
+@receiver(setting_changed)
+def _reset_pool(setting, **kwargs):
+    global _pool
+    if setting == 'PASSWORD_HASHING' and _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def make_password(password):
+    """Return the hash of password, computed in the pool."""
+    return get_pool().run(hashers.make_password, password)
+
+
+def _verify(password, encoded):
+    """Return whether password matches and, if the policy changed, a new hash."""
+    upgraded = []
+    valid = hashers.check_password(
+        password, encoded, setter=lambda raw: upgraded.append(hashers.make_password(raw)),
+    )
+    return valid, upgraded[0] if upgraded else None
+
+
+def check_password(password, encoded):
+    """Return True if password matches encoded, checked in the pool."""
+    return verify_password(password, encoded)[0]
+
+
+def verify_password(password, encoded):
+    """Return (valid, new hash or None), checked in the pool.
+
+    A new hash is returned for a correct password whose hash does not
+    follow PASSWORD_HASHER_POLICY.
+    """
+    return get_pool().run(_verify, password, encoded)
+
+
+def authenticate(request, email, password):
+    """Return the active user with these credentials, or None.
+
+    Equivalent to django.contrib.auth.authenticate() with ModelBackend, the
+    only backend this project uses, but checks the password in the pool.
+    Like ModelBackend, it upgrades the stored hash on success if needed.
+    """
+    user_model = get_user_model()
+    try:
+        user = user_model._default_manager.get_by_natural_key(email)
+    except user_model.DoesNotExist:
+        # Hash anyway so response times do not reveal which emails exist.
+        make_password(password)
+        user = None
+    else:
+        valid, upgraded = verify_password(password, user.password)
+        if not (valid and user.is_active):
+            user = None
+        elif upgraded:
+            user.password = upgraded
+            user.save(update_fields=['password'])
+
+    if user is None:
+        user_login_failed.send(
+            sender=__name__, credentials={'username': email}, request=request,
+        )
+    return user
@@ -0,0 +1,97 @@
+"""
+Django command to benchmark password hashers on this host.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+# Work factors to try per algorithm: class attribute -> values. The first
+# value of each list is the current Django default.
+WORK_FACTORS = {
+    'pbkdf2_sha256': [
+        {'iterations': 260000}, {'iterations': 120000},
+        {'iterations': 390000}, {'iterations': 600000},
+    ],
+    'argon2': [
+        {'time_cost': 2, 'memory_cost': 102400, 'parallelism': 8},
+        {'time_cost': 1, 'memory_cost': 65536, 'parallelism': 4},
+        {'time_cost': 3, 'memory_cost': 65536, 'parallelism': 4},
+        {'time_cost': 2, 'memory_cost': 262144, 'parallelism': 8},
+    ],
+    'bcrypt_sha256': [
+        {'rounds': 12}, {'rounds': 10}, {'rounds': 13}, {'rounds': 14},
+    ],
+    'scrypt': [
+        {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 1},
+        {'work_factor': 2 ** 15, 'block_size': 8, 'parallelism': 1},
+        {'work_factor': 2 ** 16, 'block_size': 8, 'parallelism': 1},
+    ],
+}
+
+
+class Command(BaseCommand):
+    """Django command to time each password hasher at several work factors"""
+    help = (
+        "Time one login (a password check) with each available hasher at "
+        "several work factors, to choose PASSWORD_HASHER_POLICY with data. "
+        "Each check occupies one CPU core for the time shown."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--algorithm', action='append', choices=list(WORK_FACTORS),
+            help='Only benchmark this algorithm. Can be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        current = get_hasher('default')
+        self.stdout.write(
+            f"Current policy: {current.algorithm} "
+            f"{self._describe(current, WORK_FACTORS.get(current.algorithm, [{}])[0])}"
+        )
+        self.stdout.write(
+            f"  {'algorithm':<15}{'work factors':<48}{'ms/login':>10}{'logins/s/core':>15}"
+        )
+
+        for algorithm in options['algorithm'] or WORK_FACTORS:
+            hasher_class = import_string(settings.PASSWORD_HASHER_CLASSES[algorithm])
+            for factors in WORK_FACTORS[algorithm]:
+                hasher = type(hasher_class.__name__, (hasher_class,), factors)()
+                try:
+                    seconds = self._time(hasher, options['repeat'])
+                except ValueError as exc:
+                    # The hasher's library is not installed.
+                    self.stdout.write(self.style.WARNING(f'  {algorithm:<15}{exc}'))
+                    break
+
+                line = (
+                    f'  {algorithm:<15}{self._describe(hasher, factors):<48}'
+                    f'{seconds * 1000:>10.1f}{1 / seconds:>15.1f}'
+                )
+                if algorithm == current.algorithm and all(
+                    getattr(current, name) == value for name, value in factors.items()
+                ):
+                    line += '  <- current'
+                self.stdout.write(line)
+
+    @staticmethod
+    def _describe(hasher, factors):
+        return ', '.join(f'{name}={getattr(hasher, name)}' for name in factors)
+
+    @staticmethod
+    def _time(hasher, repeat):
+        """Return the median time of verifying a password."""
+        encoded = hasher.encode('correct horse battery staple', hasher.salt())
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hasher.verify('correct horse battery staple', encoded)
+            timings.append(time.perf_counter() - started)
+
+        return statistics.median(timings)
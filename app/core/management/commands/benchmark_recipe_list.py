@@ -0,0 +1,96 @@
+"""
+Django command to benchmark serializing and rendering the recipe list.
+"""
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Recipe
+from core.renderers import FastJSONRenderer
+from recipe.serializers import RecipeSerializer, RecipeValuesSerializer
+
+
+class Command(BaseCommand):
+    """Django command to compare list serializers and JSON renderers"""
+    help = (
+        "Time RecipeSerializer(many=True) against RecipeValuesSerializer, "
+        "and JSONRenderer against FastJSONRenderer, on temporary recipes. "
+        "Nothing is left in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(
+                email='benchmark@example.com',
+            )
+            Recipe.objects.bulk_create(
+                Recipe(
+                    user=user,
+                    title=f'Recipe {i}',
+                    time_minutes=i % 120,
+                    price=Decimal(i % 1000) / 10,
+                    link='https://example.com/recipe.pdf',
+                )
+                for i in range(options['rows'])
+            )
+            queryset = Recipe.objects.filter(user=user).order_by('-id')
+
+            renderer = JSONRenderer()
+            drf = self._time(
+                lambda: RecipeSerializer(queryset.all(), many=True).data,
+                options['repeat'],
+            )
+            fast = self._time(
+                lambda: RecipeValuesSerializer(RecipeSerializer()).serialize_queryset(
+                    queryset.all()
+                ),
+                options['repeat'],
+            )
+            if renderer.render(drf['data']) != renderer.render(fast['data']):
+                raise CommandError('Fast serializer output differs from RecipeSerializer.')
+
+            stdlib = self._time(lambda: renderer.render(fast['data']), options['repeat'])
+            fast_json = self._time(
+                lambda: FastJSONRenderer().render(fast['data']), options['repeat'],
+            )
+            if stdlib['data'] != fast_json['data']:
+                raise CommandError('FastJSONRenderer output differs from JSONRenderer.')
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{options['rows']} rows, best of {options['repeat']}:")
+        self._report('RecipeSerializer', 'RecipeValuesSerializer', drf, fast)
+        self._report('JSONRenderer', 'FastJSONRenderer', stdlib, fast_json)
+        size = len(fast_json['data'])
+        self.stdout.write(
+            f"  FastJSONRenderer throughput: {size / fast_json['seconds'] / 2 ** 20:.0f} MiB/s "
+            f"({size / 2 ** 20:.1f} MiB payload)"
+        )
+
+    def _report(self, baseline_name, fast_name, baseline, fast):
+        self.stdout.write(f"  {baseline_name:<24}{baseline['seconds'] * 1000:8.1f} ms")
+        self.stdout.write(f"  {fast_name:<24}{fast['seconds'] * 1000:8.1f} ms")
+        self.stdout.write(self.style.SUCCESS(
+            f"  Identical output, {baseline['seconds'] / fast['seconds']:.1f}x faster."
+        ))
+
+    @staticmethod
+    def _time(func, repeat):
+        """Return the best wall time of func, including its queries."""
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        return {'seconds': best, 'data': data}
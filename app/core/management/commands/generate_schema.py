@@ -0,0 +1,33 @@
+"""
+Django command to precompute the OpenAPI schema.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import schema
+
+
+class Command(BaseCommand):
+    """Django command to write the OpenAPI schema files"""
+    help = (
+        "Generate the OpenAPI schema as YAML and JSON so /api/schema serves "
+        "files instead of introspecting the API. Run it on every deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            help='Directory to write to. Defaults to the API_SCHEMA_DIR setting.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        directory = options['dir'] or settings.API_SCHEMA['DIR']
+        if not directory:
+            raise CommandError('Pass --dir or set API_SCHEMA_DIR.')
+
+        for path in schema.write(directory):
+            self.stdout.write(f'Wrote {path}')
+        schema.clear()
+
+        self.stdout.write(self.style.SUCCESS('Schema generated.'))
@@ -0,0 +1,124 @@
+"""
+Django command to bulk import recipes from NDJSON or CSV.
+"""
+import csv
+import json
+import os
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from core.models import Recipe
+from recipe import cache
+from recipe.serializers import RecipeDetailSerializer
+
+
+class Command(BaseCommand):
+    """Django command to import recipes for a user"""
+    help = "Stream recipes from an NDJSON or CSV file (or stdin) into the database."
+    stealth_options = ('stdin',)
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin.")
+        parser.add_argument(
+            '--user', required=True,
+            help='Email of the user who will own the recipes.',
+        )
+        parser.add_argument(
+            '--format', choices=['ndjson', 'csv'],
+            help='Input format. Defaults to the file extension, or ndjson.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows inserted per query.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        try:
+            user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist.")
+
+        path = options['path']
+        input_format = options['format']
+        if input_format is None:
+            extension = os.path.splitext(path)[1].lstrip('.').lower()
+            input_format = 'csv' if extension == 'csv' else 'ndjson'
+
+        if path == '-':
+            stream = options.get('stdin', sys.stdin)
+            self._import(stream, input_format, user, options['batch_size'])
+        else:
+            with open(path, newline='', encoding='utf-8') as stream:
+                self._import(stream, input_format, user, options['batch_size'])
+
+    def _read_rows(self, stream, input_format):
+        """Yield (line number, row) pairs without reading the whole input."""
+        if input_format == 'csv':
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as exc:
+                yield line_number, exc
+
+    def _import(self, stream, input_format, user, batch_size):
+        """Validate rows and insert them in batches."""
+        # One serializer is reused for every row; building one per row
+        # would copy its fields each time.
+        serializer = RecipeDetailSerializer()
+        batch = []
+        imported = skipped = 0
+        started = time.monotonic()
+
+        for line_number, row in self._read_rows(stream, input_format):
+            try:
+                if isinstance(row, Exception):
+                    raise ValidationError(str(row))
+                attrs = serializer.run_validation(row)
+            except ValidationError as exc:
+                skipped += 1
+                self.stderr.write(f'Line {line_number}: {exc.detail}')
+                continue
+
+            batch.append(Recipe(user=user, **attrs))
+            if len(batch) >= batch_size:
+                imported += self._insert(batch)
+                batch = []
+                self._report(imported, started)
+
+        if batch:
+            imported += self._insert(batch)
+
+        # bulk_create() sends no signals, so invalidate cached responses here.
+        cache.invalidate(user.pk)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} recipes, skipped {skipped} '
+            f'in {elapsed:.1f}s ({self._rate(imported, elapsed):.0f} rows/s).'
+        ))
+
+    def _insert(self, batch):
+        Recipe.objects.bulk_create(batch)
+        return len(batch)
+
+    def _report(self, imported, started):
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{imported} rows ({self._rate(imported, elapsed):.0f} rows/s)'
+        )
+
+    @staticmethod
+    def _rate(rows, elapsed):
+        return rows / elapsed if elapsed else 0
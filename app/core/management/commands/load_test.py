@@ -0,0 +1,88 @@
+"""
+Django command to load test a running API server.
+"""
+import http.client
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """Django command to measure throughput and latency of an endpoint"""
+    help = (
+        "Send GET requests to a URL from concurrent keep-alive connections "
+        "and report throughput and latency percentiles. Run it against the "
+        "WSGI and ASGI servers to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='URL to request, e.g. http://localhost:8000/api/recipe/recipes/.')
+        parser.add_argument('--token', help='API token sent as "Authorization: Token ...".')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument(
+            '--unique', action='store_true',
+            help='Add a distinct query parameter to every request to bypass response caches.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.netloc:
+            raise CommandError('Only http:// URLs are supported.')
+
+        headers = {'Accept': 'application/json'}
+        if options['token']:
+            headers['Authorization'] = f"Token {options['token']}"
+        path = url.path + (f'?{url.query}' if url.query else '')
+
+        counter = iter(range(options['requests']))
+        lock = threading.Lock()
+        local = threading.local()
+
+        def request(_):
+            with lock:
+                number = next(counter)
+            target = path
+            if options['unique']:
+                target += f"{'&' if '?' in path else '?'}_={number}"
+
+            if not hasattr(local, 'connection'):
+                local.connection = http.client.HTTPConnection(url.netloc, timeout=60)
+            started = time.perf_counter()
+            try:
+                local.connection.request('GET', target, headers=headers)
+                response = local.connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                local.connection.close()
+                del local.connection
+                status = None
+
+            return time.perf_counter() - started, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(request, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, status in results if status is None or status >= 400)
+        percentiles = statistics.quantiles(latencies, n=100)
+
+        self.stdout.write(
+            f"{options['requests']} requests, concurrency {options['concurrency']}, "
+            f"{elapsed:.1f}s"
+        )
+        self.stdout.write(f"  throughput {len(results) / elapsed:8.1f} req/s")
+        for name, value in (
+            ('p50', percentiles[49]), ('p95', percentiles[94]), ('p99', percentiles[98]),
+        ):
+            self.stdout.write(f"  {name} latency {value * 1000:8.1f} ms")
+        style = self.style.ERROR if errors else self.style.SUCCESS
+        self.stdout.write(style(f'  {errors} errors'))
@@ -0,0 +1,45 @@
+"""
+Django command to delete expired auth tokens.
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import tokens
+
+
+class Command(BaseCommand):
+    """Django command to delete tokens idle for longer than TOKEN_EXPIRY"""
+    help = (
+        "Delete auth tokens that have not been used for "
+        "TOKEN_EXPIRY['IDLE_TIMEOUT'] seconds, in batches. Run it from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only count the expired tokens.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        now = timezone.now()
+        if options['dry_run']:
+            count = tokens.expired_tokens(now).count()
+            self.stdout.write(f'{count} expired tokens.')
+            return
+
+        deleted = 0
+        while True:
+            keys = list(
+                tokens.expired_tokens(now).values_list('key', flat=True)[:options['batch_size']]
+            )
+            if not keys:
+                break
+            # Filter again so a token used since the select survives.
+            batch = tokens.expired_tokens(now).filter(key__in=keys)
+            deleted += batch.delete()[1].get('authtoken.Token', 0)
+            if len(keys) < options['batch_size']:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired tokens.'))
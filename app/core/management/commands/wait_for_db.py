@@ -1,7 +1,7 @@
 """
 Django command to wait for the database to be available.
 """
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db.utils import OperationalError
 
 import time
@@ -12,18 +12,37 @@ class Command(BaseCommand):
     """Django command to wait for database"""
     help = "This command is used to wait for the database until it gets configured!"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default='default',
+            help='Database alias to wait for.',
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=0,
+            help='Give up after this many seconds. 0 waits forever.',
+        )
+        parser.add_argument(
+            '--max-interval', type=float, default=5,
+            help='Longest wait between attempts; waits double from 1 sec.',
+        )
+
     def handle(self, *args, **options):
         """Entrypoint for command"""
         self.stdout.write("waiting for databse...")
+        deadline = time.monotonic() + options['timeout'] if options['timeout'] else None
+        delay = 1
         db_up = False
         while db_up is False:
             try:
-                self.check(databases=['default'])
+                self.check(databases=[options['database']])
                 db_up = True
 
             except (Psycopg2Error, OperationalError):
-                self.stdout.write("Database unavailable, waiting 1 sec.")
-                time.sleep(1)
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    raise CommandError('Database unavailable, giving up.')
+                self.stdout.write(f"Database unavailable, waiting {delay:g} sec.")
+                time.sleep(delay)
+                delay = min(delay * 2, options['max_interval'])
         
         self.stdout.write(self.style.SUCCESS('Database available!'))
 
@@ -0,0 +1,127 @@
+"""
+Request latency metrics.
+
+Counters live in the Django cache, like the recipe cache statistics, so they
+cover every server process when a shared CACHE_BACKEND is configured.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+KEY_PREFIX = 'metrics:'
+
+# Upper bounds of the latency histogram buckets, in milliseconds.
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_endpoints = set()
+_counters = set()
+
+
+def _cache():
+    return caches[settings.METRICS['CACHE_ALIAS']]
+
+
+def register_counter(name):
+    """List a counter in stats() even before it is first incremented."""
+    _counters.add(name)
+
+
+def increment(name, delta=1):
+    """Add delta to a counter."""
+    _counters.add(name)
+    _incr(_cache(), KEY_PREFIX + name, delta)
+
+
+def observe(endpoint, seconds, status_code):
+    """Record the latency and status of one request to an endpoint."""
+    cache = _cache()
+    prefix = f'{KEY_PREFIX}{endpoint}:'
+    milliseconds = seconds * 1000
+    bucket = next((bound for bound in BUCKETS_MS if milliseconds <= bound), 'inf')
+
+    _incr(cache, prefix + 'count')
+    _incr(cache, prefix + 'total_ms', round(milliseconds))
+    _incr(cache, f'{prefix}le:{bucket}')
+    if status_code >= 500:
+        _incr(cache, prefix + 'errors')
+
+
+def stats():
+    """Return the latency summary of every endpoint and the counters."""
+    cache = _cache()
+    counters = cache.get_many([KEY_PREFIX + name for name in _counters])
+
+    return {
+        'endpoints': {name: _endpoint_stats(cache, name) for name in sorted(_endpoints)},
+        'counters': {
+            name: counters.get(KEY_PREFIX + name, 0) for name in sorted(_counters)
+        },
+    }
+
+
+def _endpoint_stats(cache, endpoint):
+    prefix = f'{KEY_PREFIX}{endpoint}:'
+    bounds = [*BUCKETS_MS, 'inf']
+    values = cache.get_many(
+        [prefix + 'count', prefix + 'total_ms', prefix + 'errors']
+        + [f'{prefix}le:{bound}' for bound in bounds]
+    )
+    count = values.get(prefix + 'count', 0)
+    buckets = {str(bound): values.get(f'{prefix}le:{bound}', 0) for bound in bounds}
+
+    return {
+        'count': count,
+        'errors': values.get(prefix + 'errors', 0),
+        'mean_ms': values.get(prefix + 'total_ms', 0) / count if count else None,
+        'p50_ms': _percentile(buckets, count, 0.50),
+        'p95_ms': _percentile(buckets, count, 0.95),
+        'p99_ms': _percentile(buckets, count, 0.99),
+        'buckets_ms': buckets,
+    }
+
+
+def _percentile(buckets, count, fraction):
+    """Return the upper bound of the bucket holding a percentile."""
+    if not count:
+        return None
+
+    seen = 0
+    for bound, bucket_count in buckets.items():
+        seen += bucket_count
+        if seen >= count * fraction:
+            return None if bound == 'inf' else int(bound)
+    return None
+
+
+def _incr(cache, key, delta=1):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # First increment of the key; add() loses only to a concurrent first.
+        if not cache.add(key, delta, None):
+            cache.incr(key, delta)
+
+
+class LatencyMetricsMixin:
+    """Record the latency of every request to an API view.
+
+    Requests are recorded under ``metrics_name``, or the view class name.
+    Each request costs a few cache round trips, so use it on expensive
+    endpoints such as login and signup, not on cached reads.
+    """
+    metrics_name = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _endpoints.add(cls.metrics_name or cls.__name__)
+
+    def dispatch(self, request, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().dispatch(request, *args, **kwargs)
+        observe(
+            self.metrics_name or type(self).__name__,
+            time.perf_counter() - started,
+            response.status_code,
+        )
+        return response
@@ -0,0 +1,118 @@
+"""
+Middleware for the API.
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+def _gzip_compressor(level):
+    # wbits=31 writes a gzip header and trailer around the deflate stream.
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def _accepted_encodings(header):
+    """Return the codings accepted by an Accept-Encoding header."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip().lower()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+
+    return accepted
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress responses with brotli or gzip when the client accepts it.
+
+    Unlike Django's GZipMiddleware, only the content types listed in
+    ``COMPRESSION['CONTENT_TYPES']`` (prefix match) are compressed, small
+    bodies under ``MIN_SIZE`` bytes are left alone so no CPU is spent where
+    it cannot pay off, and the compression levels are configurable.
+    Streaming responses are compressed chunk by chunk as they are sent.
+    Brotli is used when the ``brotli`` package is installed.
+    """
+
+    def process_response(self, request, response):
+        """Compress the response body if worthwhile."""
+        config = settings.COMPRESSION
+
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and len(response.content) < config['MIN_SIZE']:
+            return response
+
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if not content_type.startswith(tuple(config['CONTENT_TYPES'])):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in accepted:
+            encoding = 'br'
+        elif 'gzip' in accepted:
+            encoding = 'gzip'
+        else:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self._compress_stream(
+                response.streaming_content, encoding, config,
+            )
+            # The compressed size is unknown until the stream is finished.
+            del response['Content-Length']
+        else:
+            compressed = self._compress(response.content, encoding, config)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # A strong ETag must change with the encoding; weaken it so that
+        # conditional requests still match (RFC 7232 section 2.1).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+
+        return response
+
+    @staticmethod
+    def _compress(content, encoding, config):
+        if encoding == 'br':
+            return brotli.compress(content, quality=config['BROTLI_QUALITY'])
+
+        compressor = _gzip_compressor(config['GZIP_LEVEL'])
+        return compressor.compress(content) + compressor.flush()
+
+    @staticmethod
+    def _compress_stream(chunks, encoding, config):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=config['BROTLI_QUALITY'])
+            for chunk in chunks:
+                data = compressor.process(chunk)
+                if data:
+                    yield data
+            yield compressor.finish()
+            return
+
+        compressor = _gzip_compressor(config['GZIP_LEVEL'])
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:06
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def create_activity(apps, schema_editor):
+    """Count existing tokens as used now, so they do not all expire on deploy."""
+    Token = apps.get_model('authtoken', 'Token')
+    TokenActivity = apps.get_model('core', 'TokenActivity')
+    db_alias = schema_editor.connection.alias
+    now = timezone.now()
+    keys = Token.objects.using(db_alias).values_list('key', flat=True).iterator()
+    batch = []
+    for key in keys:
+        batch.append(TokenActivity(token_id=key, last_seen=now))
+        if len(batch) == 1000:
+            TokenActivity.objects.using(db_alias).bulk_create(batch)
+            batch = []
+    TokenActivity.objects.using(db_alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authtoken', '0003_tokenproxy'),
+        ('core', '0006_recipe_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenActivity',
+            fields=[
+                ('token', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity', serialize=False, to='authtoken.token')),
+                ('last_seen', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'token activity',
+            },
+        ),
+        migrations.RunPython(create_activity, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,10 @@
 Database models
 """
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from rest_framework.authtoken.models import Token
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -56,6 +59,8 @@ class Recipe(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        # Covered by the leading column of recipe_user_id_desc_idx.
+        db_index=False,
     )
 
     title = models.CharField(max_length=255)
@@ -63,6 +68,39 @@ class Recipe(models.Model):
     time_minutes = models.IntegerField()
     price = models.DecimalField(max_digits=5, decimal_places=2)
     link = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Weighted title and description, maintained by a database trigger so
+    # bulk inserts and updates keep it current too (see migration 0005).
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Backs the recipe list query: filter on user, newest first.
+            models.Index(fields=['user', '-id'], name='recipe_user_id_desc_idx'),
+            # Back the whitelisted orderings and range filters of the list.
+            models.Index(fields=['user', 'price', 'id'], name='recipe_user_price_idx'),
+            models.Index(fields=['user', 'time_minutes', 'id'], name='recipe_user_time_idx'),
+            models.Index(fields=['user', 'title', 'id'], name='recipe_user_title_idx'),
+            GinIndex(fields=['search_vector'], name='recipe_search_vector_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class TokenActivity(models.Model):
+    """When an auth token was last used, written in batches by core.tokens."""
+
+    token = models.OneToOneField(
+        Token,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='activity',
+    )
+    last_seen = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name_plural = 'token activity'
+
+    def __str__(self):
+        return f'{self.token_id}: {self.last_seen}'
@@ -0,0 +1,48 @@
+"""
+Parsers shared by the API.
+"""
+import re
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import json
+
+from core.renderers import FastJSONRenderer, orjson
+
+# orjson reads integers beyond 64 bits as floats; leave those to the stdlib.
+_LONG_NUMBER = re.compile(rb'\d{20,}')
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSON parser using orjson, with DRF's stdlib parser as fallback.
+
+    orjson only reads UTF-8 and, like STRICT_JSON, rejects NaN/Infinity.
+    Other encodings, non-strict mode and anything orjson cannot load
+    the same way (integers beyond 64 bits) go through the stdlib so results and
+    error messages match ``JSONParser``.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming bytestream as JSON."""
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        body = stream.read()
+
+        if (
+            orjson is not None
+            and self.strict
+            and encoding.lower() in ('utf-8', 'utf8')
+            and not _LONG_NUMBER.search(body)
+        ):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(body.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
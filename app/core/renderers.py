@@ -0,0 +1,51 @@
+"""
+Renderers shared by the API.
+"""
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSON renderer using orjson, with DRF's stdlib renderer as fallback.
+
+    Output matches ``JSONRenderer`` byte for byte: types orjson does not
+    encode the same way (Decimal, datetimes, lazy strings) are handed to
+    DRF's encoder, and anything orjson rejects (e.g. integers beyond 64
+    bits) is re-rendered by the stdlib path. The exceptions are floats:
+    exponents are written as ``1e30`` instead of ``1e+30`` and NaN as
+    ``null``; the API itself only emits Decimals, as strings.
+
+    Indented output (e.g. the browsable API) and non-default
+    UNICODE_JSON/COMPACT_JSON settings always use the stdlib path.
+    """
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_NON_STR_KEYS
+    ) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON bytes."""
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape U+2028/U+2029 like JSONRenderer to stay a JavaScript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+        return ret
@@ -0,0 +1,106 @@
+"""
+Read-replica routing.
+
+Queries go to the primary (``default``) unless a view opts in to replica
+reads with ``ReplicaReadMixin``. A user who has just written through such a
+view is pinned to the primary for ``REPLICA_ROUTING['STICKY_SECONDS']`` so
+they read their own writes despite replication lag.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+_use_replica = contextvars.ContextVar('use_replica', default=False)
+
+
+def replica_aliases():
+    """Return the configured replica database aliases."""
+    return settings.REPLICA_ROUTING['ALIASES']
+
+
+@contextmanager
+def replica_reads():
+    """Send reads inside the block to a replica."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def _pin_key(user_id):
+    return f'replica:pin:{user_id}'
+
+
+def pin(user_id):
+    """Read from the primary for a while after the user wrote."""
+    config = settings.REPLICA_ROUTING
+    caches[config['CACHE_ALIAS']].set(
+        _pin_key(user_id), True, config['STICKY_SECONDS'],
+    )
+
+
+def is_pinned(user_id):
+    """Return True if the user wrote recently."""
+    return bool(caches[settings.REPLICA_ROUTING['CACHE_ALIAS']].get(_pin_key(user_id)))
+
+
+class ReplicaRouter:
+    """Route reads to a random replica inside replica_reads(), else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        aliases = replica_aliases()
+        if aliases and _use_replica.get():
+            return random.choice(aliases)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()
+
+
+class ReplicaReadMixin:
+    """Serve safe requests of an API view from a replica.
+
+    ``replica_actions`` limits this to some viewset actions; None allows
+    every safe method. Unsafe requests pin the user to the primary.
+    """
+    replica_actions = None
+    _replica_token = None
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # Reset even when an exception escapes DRF's handler, so the
+            # thread does not keep reading from a replica.
+            if self._replica_token is not None:
+                _use_replica.reset(self._replica_token)
+                self._replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if not replica_aliases() or not request.user.is_authenticated:
+            return
+
+        if request.method not in SAFE_METHODS:
+            pin(request.user.pk)
+        elif self._is_replica_action() and not is_pinned(request.user.pk):
+            self._replica_token = _use_replica.set(True)
+
+    def _is_replica_action(self):
+        if self.replica_actions is None:
+            return True
+        return getattr(self, 'action', None) in self.replica_actions
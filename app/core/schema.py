@@ -0,0 +1,99 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every view and serializer, so it is done
+once: by ``manage.py generate_schema`` at deploy time, whose files are read
+from ``API_SCHEMA['DIR']``, or otherwise on the first request of a process.
+The rendered bytes are then served from memory.
+"""
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.cache import quote_etag
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+RENDERERS = {
+    'yaml': OpenApiYamlRenderer,
+    'json': OpenApiJsonRenderer,
+}
+
+_schemas = {}
+_lock = threading.Lock()
+
+
+def generate():
+    """Return the rendered schema in every format."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+
+    return {
+        schema_format: renderer().render(schema, renderer_context={})
+        for schema_format, renderer in RENDERERS.items()
+    }
+
+
+def write(directory):
+    """Generate the schema and write one file per format to a directory."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for schema_format, content in generate().items():
+        path = _path(directory, schema_format)
+        with open(path, 'wb') as schema_file:
+            schema_file.write(content)
+        paths.append(path)
+
+    return paths
+
+
+def get_schema(schema_format):
+    """Return the (content, etag) of the schema in a format."""
+    if not _schemas:
+        with _lock:
+            if not _schemas:
+                contents = _read(settings.API_SCHEMA['DIR']) or generate()
+                _schemas.update(
+                    (schema_format, (content, _make_etag(content)))
+                    for schema_format, content in contents.items()
+                )
+
+    return _schemas[schema_format]
+
+
+def clear():
+    """Forget the schema so it is read or generated again."""
+    _schemas.clear()
+
+
+def _read(directory):
+    """Return the schema files in a directory, or None if any is missing."""
+    if not directory:
+        return None
+
+    contents = {}
+    for schema_format in RENDERERS:
+        try:
+            with open(_path(directory, schema_format), 'rb') as schema_file:
+                contents[schema_format] = schema_file.read()
+        except FileNotFoundError:
+            return None
+
+    return contents
+
+
+def _path(directory, schema_format):
+    return os.path.join(directory, f'schema.{schema_format}')
+
+
+def _make_etag(content):
+    return quote_etag(hashlib.md5(content).hexdigest())
+
+
+@receiver(setting_changed)
+def _reset_schema(setting, **kwargs):
+    if setting == 'API_SCHEMA':
+        clear()
@@ -0,0 +1,27 @@
+"""
+Signal handlers for the core models.
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from core.authentication import get_token_cache
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Stop accepting a token as soon as it is deleted."""
+    get_token_cache().delete(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """Drop cached tokens of a changed user, e.g. when deactivated."""
+    if created:
+        return
+
+    token_cache = get_token_cache()
+    keys = Token.objects.filter(user=instance).values_list('key', flat=True)
+    for key in keys:
+        token_cache.delete(key)
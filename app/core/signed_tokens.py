@@ -0,0 +1,126 @@
+"""
+Stateless signed access tokens.
+
+With ``SIGNED_TOKENS['ENABLED']`` the token endpoint returns a short-lived
+access token and a refresh token instead of a database token. An access
+token is the user id and issue time signed with an HMAC of
+``SIGNED_TOKENS['SIGNING_KEY']``, so verifying it needs no query; it cannot
+be revoked and stays valid for ACCESS_TTL seconds. Reads with the token of
+a deleted user see no objects; writes load the user and are rejected.
+Refresh tokens are checked against the user in the database, and stop
+working when the user is deactivated or changes password. Signed tokens are
+only accepted while ENABLED; database tokens keep working in either mode.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.crypto import salted_hmac
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from rest_framework import exceptions, permissions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+ACCESS_SALT = 'core.signed_tokens.access'
+REFRESH_SALT = 'core.signed_tokens.refresh'
+
+
+def _signing_key():
+    key = settings.SIGNED_TOKENS.get('SIGNING_KEY')
+    if not key:
+        raise ImproperlyConfigured("SIGNED_TOKENS['SIGNING_KEY'] must be set.")
+    return key
+
+
+def _fingerprint(user):
+    """Return a value that changes when the user's credentials change."""
+    return salted_hmac(
+        REFRESH_SALT, f'{user.password}{user.is_active}', secret=_signing_key(),
+    ).hexdigest()[:16]
+
+
+def issue(user):
+    """Return a new access and refresh token for user."""
+    config = settings.SIGNED_TOKENS
+    key = _signing_key()
+    return {
+        'access': signing.TimestampSigner(key, salt=ACCESS_SALT).sign(str(user.pk)),
+        'refresh': signing.TimestampSigner(key, salt=REFRESH_SALT).sign(
+            f'{user.pk}.{_fingerprint(user)}'
+        ),
+        'expires_in': config['ACCESS_TTL'],
+    }
+
+
+def _unsign(token, salt, max_age):
+    signer = signing.TimestampSigner(_signing_key(), salt=salt)
+    try:
+        return signer.unsign(token, max_age=max_age)
+    except signing.SignatureExpired:
+        raise exceptions.AuthenticationFailed(_('Token has expired.'))
+    except signing.BadSignature:
+        raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+
+def verify_access(token):
+    """Return the user id of a valid access token."""
+    return int(_unsign(token, ACCESS_SALT, settings.SIGNED_TOKENS['ACCESS_TTL']))
+
+
+def verify_refresh(token):
+    """Return the active user of a valid refresh token."""
+    user_id, fingerprint = _unsign(
+        token, REFRESH_SALT, settings.SIGNED_TOKENS['REFRESH_TTL'],
+    ).split('.')
+    user = get_user_model()._default_manager.filter(pk=user_id, is_active=True).first()
+    if user is None or fingerprint != _fingerprint(user):
+        raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+    return user
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """Authenticate "Authorization: Bearer <access token>" without queries.
+
+    On reads, request.user is an unsaved user instance with only its id
+    set, which is enough to filter the user's objects. Writes load the user,
+    so tokens of deleted or deactivated users cannot create objects.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        if not settings.SIGNED_TOKENS['ENABLED']:
+            return None
+
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+
+        user_id = verify_access(token)
+        if request.method in permissions.SAFE_METHODS:
+            return (get_user_model()(pk=user_id), token)
+
+        user = get_user_model()._default_manager.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (user, token)
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class SignedTokenScheme(OpenApiAuthenticationExtension):
+    """Describe SignedTokenAuthentication in the OpenAPI schema."""
+    target_class = SignedTokenAuthentication
+    name = 'signedTokenAuth'
+
+    def get_security_definition(self, auto_schema):
+        return {'type': 'http', 'scheme': 'bearer'}
@@ -0,0 +1,91 @@
+"""
+Tests for async read views.
+"""
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.async_views import async_read_view
+from core.models import Recipe
+
+RECIPES_URL = reverse('recipe:recipe-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+
+
+@override_settings(ASYNC_VIEWS=True)
+class AsyncReadViewTests(TransactionTestCase):
+    """Test serving recipe reads from the thread pool."""
+
+    def setUp(self):
+        # Pool threads hold their own connections; close them after each
+        # request so the test database can be dropped.
+        patcher = patch.dict(connection.settings_dict, CONN_MAX_AGE=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.recipe = Recipe.objects.create(
+            user=self.user, title='Soup', time_minutes=5, price='1.00',
+        )
+        self.factory = APIRequestFactory()
+
+    def call(self, view, request, **kwargs):
+        force_authenticate(request, self.user)
+        return async_to_sync(view)(request, **kwargs)
+
+    def test_read_in_pool_thread(self):
+        """Test GET runs outside the thread Django uses for sync code."""
+        threads = []
+        list_view = resolve(RECIPES_URL).func
+
+        def record(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return list_view(*args, **kwargs)
+
+        view = async_read_view(record)
+        res = self.call(view, self.factory.get(RECIPES_URL))
+
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([recipe['id'] for recipe in json.loads(res.content)], [self.recipe.id])
+        self.assertNotEqual(threads[0], threading.current_thread())
+        self.assertTrue(threads[0].name.startswith('async-read'))
+
+    def test_write(self):
+        """Test other methods still work through the async view."""
+        view = async_read_view(resolve(RECIPES_URL).func)
+
+        res = self.call(view, self.factory.post(
+            RECIPES_URL, {'title': 'Stew', 'time_minutes': 5, 'price': '2.00'},
+        ))
+
+        self.assertEqual(res.status_code, 201)
+        self.assertTrue(Recipe.objects.filter(title='Stew').exists())
+
+    def test_streaming_response_spooled(self):
+        """Test exports are produced before the event loop streams them."""
+        view = async_read_view(resolve(EXPORT_URL).func)
+
+        res = self.call(view, self.factory.get(EXPORT_URL))
+
+        with patch.object(connection, 'cursor', side_effect=AssertionError):
+            content = b''.join(res.streaming_content)
+        self.assertEqual(json.loads(content)['id'], self.recipe.id)
+
+    @override_settings(ASYNC_VIEWS=False)
+    def test_disabled(self):
+        """Test views are left alone when async views are off."""
+        view = resolve(RECIPES_URL).func
+
+        self.assertIs(async_read_view(view), view)
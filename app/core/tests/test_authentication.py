@@ -0,0 +1,103 @@
+"""
+Tests for the cached token authentication.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, SimpleTestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.authentication import CachedTokenAuthentication, get_token_cache
+from core.cache import LRUCache
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Test the in-process LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is evicted when full."""
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+
+    @patch('core.cache.time.monotonic')
+    def test_entries_expire(self, patched_monotonic):
+        """Test entries are dropped once their TTL has passed."""
+        patched_monotonic.return_value = 100
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+
+        patched_monotonic.return_value = 159
+        self.assertEqual(cache.get('a'), 1)
+
+        patched_monotonic.return_value = 160
+        self.assertIsNone(cache.get('a'))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token lookups are cached and invalidated."""
+
+    def setUp(self):
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_cached_lookup_skips_database(self):
+        """Test a second lookup of the same token runs no queries."""
+        self.auth.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_invalid_token_rejected(self):
+        """Test an unknown token is rejected."""
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials('invalid')
+
+    def test_deleted_token_invalidated(self):
+        """Test a deleted token is no longer accepted."""
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_deactivated_user_invalidated(self):
+        """Test tokens of a deactivated user are no longer accepted."""
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_shared_cache_backend(self):
+        """Test entries can live in a Django cache alias."""
+        config = {'MAX_SIZE': 10, 'TTL': 60, 'CACHE_ALIAS': 'default'}
+        key = self.token.key
+        with self.settings(TOKEN_AUTH_CACHE=config):
+            self.auth.authenticate_credentials(key)
+
+            with self.assertNumQueries(0):
+                user, _ = self.auth.authenticate_credentials(key)
+            self.assertEqual(user, self.user)
+
+            self.token.delete()
+            with self.assertRaises(AuthenticationFailed):
+                self.auth.authenticate_credentials(key)
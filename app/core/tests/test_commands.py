@@ -1,13 +1,23 @@
 """
 Test custom Django managment commands.
 """
+import io
+import os
+import tempfile
+import threading
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2Error
 
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+
+from core.models import Recipe
 
 
 @patch("core.management.commands.wait_for_db.Command.check")
@@ -34,6 +44,153 @@ class CommandTests(SimpleTestCase):
         self.assertEqual(patched_check.call_count, 6)
         patched_check.asset_called_with(databases=['default'])
 
+    @patch('time.sleep')
+    def test_wait_for_db_backoff(self, patched_sleep, patched_check):
+        """Test waits between attempts double up to the maximum."""
+        patched_check.side_effect = [OperationalError] * 5 + [True]
+
+        call_command('wait_for_db', max_interval=5, stdout=io.StringIO())
+
+        self.assertEqual(
+            [call.args[0] for call in patched_sleep.call_args_list],
+            [1, 2, 4, 5, 5],
+        )
+
+    @patch('time.monotonic', side_effect=[0, 0, 1.5])
+    @patch('time.sleep')
+    def test_wait_for_db_timeout(self, patched_sleep, patched_monotonic, patched_check):
+        """Test giving up once the timeout would be exceeded."""
+        patched_check.side_effect = OperationalError
+
+        with self.assertRaises(CommandError):
+            call_command('wait_for_db', timeout=2, stdout=io.StringIO())
+
+        self.assertEqual(patched_check.call_count, 2)
+        patched_sleep.assert_called_once_with(1)
+
+
+class ImportRecipesCommandTests(TestCase):
+    """Test the import_recipes command."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+
+    def _write_file(self, suffix, content):
+        """Write content to a temporary file and return its path."""
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_import_ndjson_in_batches(self):
+        """Test importing NDJSON inserts rows in batches."""
+        path = self._write_file('.ndjson', ''.join(
+            '{"title": "Recipe %d", "time_minutes": 5, "price": "1.50"}\n' % i
+            for i in range(5)
+        ))
+        out = io.StringIO()
+
+        with self.assertNumQueries(4):  # user lookup and three inserts
+            call_command('import_recipes', path, user=self.user.email, batch_size=2, stdout=out)
+
+        recipes = Recipe.objects.filter(user=self.user)
+        self.assertEqual(recipes.count(), 5)
+        self.assertEqual(recipes.first().price, Decimal('1.50'))
+        self.assertIn('Imported 5 recipes', out.getvalue())
+
+    def test_import_csv(self):
+        """Test importing CSV, ignoring exported ids."""
+        path = self._write_file('.csv', (
+            'id,title,time_minutes,price,link,description\n'
+            '99,"Soup, hot",10,2.00,,Warm\n'
+        ))
+
+        call_command('import_recipes', path, user=self.user.email, stdout=io.StringIO())
+
+        recipe = Recipe.objects.get(user=self.user)
+        self.assertEqual(recipe.title, 'Soup, hot')
+        self.assertEqual(recipe.description, 'Warm')
+
+    def test_import_from_stdin(self):
+        """Test reading from stdin."""
+        stdin = io.StringIO('{"title": "Piped", "time_minutes": 1, "price": "1.00"}\n')
+
+        call_command('import_recipes', '-', user=self.user.email, stdin=stdin, stdout=io.StringIO())
+
+        self.assertTrue(Recipe.objects.filter(title='Piped').exists())
+
+    def test_invalid_rows_skipped(self):
+        """Test invalid rows are reported and skipped."""
+        stdin = io.StringIO(
+            '{"title": "Good", "time_minutes": 1, "price": "1.00"}\n'
+            '{"title": "No time", "price": "1.00"}\n'
+            'not json\n'
+        )
+        err = io.StringIO()
+
+        call_command('import_recipes', '-', user=self.user.email, stdin=stdin, stdout=io.StringIO(), stderr=err)
+
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 1)
+        self.assertIn('Line 2', err.getvalue())
+        self.assertIn('Line 3', err.getvalue())
+
+    def test_unknown_user(self):
+        """Test importing for an unknown user fails."""
+        with self.assertRaises(CommandError):
+            call_command('import_recipes', '-', user='nobody@example.com')
+
+
+class BenchmarkRecipeListCommandTests(TestCase):
+    """Test the benchmark_recipe_list command."""
+
+    def test_benchmark_leaves_no_data(self):
+        """Test the benchmark reports identical output and cleans up."""
+        out = io.StringIO()
+
+        call_command('benchmark_recipe_list', rows=20, repeat=1, stdout=out)
+
+        self.assertIn('Identical output', out.getvalue())
+        self.assertFalse(Recipe.objects.exists())
+
+
+class LoadTestCommandTests(SimpleTestCase):
+    """Test the load_test command."""
+
+    def test_load_test(self):
+        """Test requests are sent and errors counted."""
+        paths = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                paths.append(self.path)
+                self.send_response(200 if self.path.endswith('0') else 503)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'{}')
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        out = io.StringIO()
+
+        call_command(
+            'load_test', f'http://127.0.0.1:{server.server_port}/api/?a=1',
+            concurrency=2, requests=10, unique=True, stdout=out,
+        )
+
+        self.assertEqual(sorted(paths), sorted(f'/api/?a=1&_={i}' for i in range(10)))
+        self.assertIn('9 errors', out.getvalue())
+
 
 
 # In Django, mocking and patching are commonly used techniques in unit testing to isolate specific parts of code and
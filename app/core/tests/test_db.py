@@ -0,0 +1,48 @@
+"""
+Tests for database connection health checks.
+"""
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import SimpleTestCase
+
+
+class ConnectionHealthCheckTests(SimpleTestCase):
+    """Test persistent connections are checked lazily, once per request."""
+    databases = {'default'}
+
+    def setUp(self):
+        connection.ensure_connection()
+        # What request_started does.
+        connection.close_if_unusable_or_obsolete()
+
+    def query(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            return cursor.fetchone()[0]
+
+    def test_checked_once_on_first_use(self):
+        """Test the check runs on the first query only, not at request start."""
+        with patch.object(connection, 'is_usable', return_value=True) as is_usable:
+            is_usable.assert_not_called()
+            self.query()
+            self.query()
+
+        is_usable.assert_called_once()
+
+    def test_unusable_connection_replaced(self):
+        """Test a dead connection is replaced before the query runs."""
+        old = connection.connection
+
+        with patch.object(connection, 'is_usable', return_value=False):
+            self.assertEqual(self.query(), 1)
+
+        self.assertIsNot(connection.connection, old)
+
+    def test_disabled(self):
+        """Test nothing is checked without CONN_HEALTH_CHECKS."""
+        with patch.dict(connection.settings_dict, {'CONN_HEALTH_CHECKS': False}), \
+                patch.object(connection, 'is_usable') as is_usable:
+            self.query()
+
+        is_usable.assert_not_called()
@@ -0,0 +1,117 @@
+"""
+Tests for the password hasher policy.
+"""
+import io
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import throttling
+from core.hashers import ScryptPasswordHasher
+
+TOKEN_URL = reverse('user:token')
+
+
+def policy(**changes):
+    return override_settings(
+        PASSWORD_HASHER_POLICY={**settings.PASSWORD_HASHER_POLICY, **changes},
+    )
+
+
+class HasherPolicyTests(SimpleTestCase):
+    """Test hashers follow PASSWORD_HASHER_POLICY."""
+
+    @policy(PBKDF2_ITERATIONS=1000)
+    def test_pbkdf2_iterations(self):
+        """Test PBKDF2 uses the policy's iterations."""
+        encoded = make_password('testpass123')
+
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$1000$'))
+        with policy(PBKDF2_ITERATIONS=2000):
+            self.assertTrue(identify_hasher(encoded).must_update(encoded))
+
+    @policy(SCRYPT_WORK_FACTOR=2 ** 10)
+    def test_scrypt(self):
+        """Test scrypt hashes verify and follow the policy."""
+        hasher = ScryptPasswordHasher()
+        encoded = hasher.encode('testpass123', hasher.salt())
+
+        self.assertTrue(encoded.startswith('scrypt$1024$'))
+        self.assertTrue(hasher.verify('testpass123', encoded))
+        self.assertFalse(hasher.verify('wrong', encoded))
+        self.assertFalse(hasher.must_update(encoded))
+        with policy(SCRYPT_WORK_FACTOR=2 ** 11):
+            self.assertTrue(hasher.must_update(encoded))
+
+    def test_benchmark_hashers(self):
+        """Test the benchmark reports each work factor."""
+        factors = {'pbkdf2_sha256': [{'iterations': 1000}, {'iterations': 2000}]}
+        out = io.StringIO()
+
+        with patch(
+            'core.management.commands.benchmark_hashers.WORK_FACTORS', factors,
+        ), policy(PBKDF2_ITERATIONS=1000):
+            call_command('benchmark_hashers', repeat=1, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertIn('iterations=1000', lines[0])
+        self.assertIn('<- current', lines[2])
+        self.assertIn('iterations=2000', lines[3])
+
+
+@override_settings(PASSWORD_HASHING={'WORKERS': 0, 'MAX_PENDING': 1, 'TIMEOUT': 10})
+class RehashOnLoginTests(TestCase):
+    """Test stored hashes are upgraded when a user logs in."""
+
+    def setUp(self):
+        self.client = APIClient()
+        throttling.clear()
+        with policy(PBKDF2_ITERATIONS=1000):
+            self.user = get_user_model().objects.create_user(
+                email='user@example.com', password='testpass123',
+            )
+
+    def login(self, password='testpass123'):
+        return self.client.post(TOKEN_URL, {'email': 'user@example.com', 'password': password})
+
+    @policy(PBKDF2_ITERATIONS=2000)
+    def test_rehash_work_factor(self):
+        """Test a hash with old work factors is upgraded."""
+        res = self.login()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(check_password('testpass123', self.user.password))
+
+    @policy(PBKDF2_ITERATIONS=2000)
+    def test_no_rehash_on_failed_login(self):
+        """Test a wrong password leaves the hash alone."""
+        password = self.user.password
+
+        res = self.login('wrong')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, password)
+
+    @policy(SCRYPT_WORK_FACTOR=2 ** 10)
+    def test_rehash_algorithm(self):
+        """Test changing the preferred algorithm upgrades hashes."""
+        hashers = [
+            settings.PASSWORD_HASHER_CLASSES['scrypt'],
+            settings.PASSWORD_HASHER_CLASSES['pbkdf2_sha256'],
+        ]
+        with self.settings(PASSWORD_HASHERS=hashers):
+            res = self.login()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$1024$'))
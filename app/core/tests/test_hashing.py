@@ -0,0 +1,79 @@
+"""
+Tests for the password hashing pool.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import hashing, metrics, throttling
+
+TOKEN_URL = reverse('user:token')
+CREATE_USER_URL = reverse('user:create')
+
+
+def pool_settings(workers=1, max_pending=1):
+    return override_settings(PASSWORD_HASHING={
+        'WORKERS': workers,
+        'MAX_PENDING': max_pending,
+        'TIMEOUT': 30,
+    })
+
+
+class HashingPoolTests(SimpleTestCase):
+    """Test hashing in worker processes."""
+
+    @pool_settings(workers=1, max_pending=2)
+    def test_hash_in_pool(self):
+        """Test passwords are hashed and checked in the pool."""
+        encoded = hashing.make_password('testpass123')
+
+        self.assertTrue(check_password('testpass123', encoded))
+        self.assertTrue(hashing.check_password('testpass123', encoded))
+        self.assertFalse(hashing.check_password('wrong', encoded))
+        self.assertEqual(hashing.get_pool().stats()['pending'], 0)
+
+    @pool_settings(workers=0)
+    def test_inline(self):
+        """Test WORKERS=0 hashes on the calling thread."""
+        self.assertEqual(hashing.get_pool().run(len, 'abc'), 3)
+
+
+class HashingBackpressureTests(TestCase):
+    """Test login and signup when the pool is saturated."""
+
+    def setUp(self):
+        caches['default'].clear()
+        throttling.clear()
+        self.client = APIClient()
+        get_user_model().objects.create_user(email='user@example.com', password='testpass123')
+
+    @pool_settings(workers=1, max_pending=1)
+    def test_saturated_pool_returns_503(self):
+        """Test requests beyond the backlog fail fast with Retry-After."""
+        pool = hashing.get_pool()
+        pool._slots.acquire()
+        self.addCleanup(pool._slots.release)
+
+        res = self.client.post(TOKEN_URL, {'email': 'user@example.com', 'password': 'testpass123'})
+        res_signup = self.client.post(CREATE_USER_URL, {
+            'email': 'new@example.com', 'password': 'testpass123', 'name': 'New',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res['Retry-After'], '1')
+        self.assertEqual(res_signup.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(get_user_model().objects.filter(email='new@example.com').exists())
+        self.assertEqual(metrics.stats()['counters'][hashing.REJECTED_METRIC], 2)
+
+    @pool_settings(workers=0)
+    def test_inactive_user_rejected(self):
+        """Test inactive users cannot get a token."""
+        get_user_model().objects.filter(email='user@example.com').update(is_active=False)
+
+        res = self.client.post(TOKEN_URL, {'email': 'user@example.com', 'password': 'testpass123'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
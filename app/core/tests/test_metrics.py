@@ -0,0 +1,85 @@
+"""
+Tests for request latency metrics.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import metrics, throttling
+
+METRICS_URL = reverse('api-metrics')
+RECIPES_URL = reverse('recipe:recipe-list')
+CREATE_USER_URL = reverse('user:create')
+
+
+class MetricsTests(TestCase):
+    """Test recording and reporting latencies."""
+
+    def setUp(self):
+        caches['default'].clear()
+        throttling.clear()
+        self.client = APIClient()
+
+    def test_observe(self):
+        """Test latencies land in histogram buckets."""
+        metrics.observe('Example', 0.004, 200)
+        metrics.observe('Example', 0.2, 200)
+        metrics.observe('Example', 20, 500)
+        metrics._endpoints.add('Example')
+        self.addCleanup(metrics._endpoints.discard, 'Example')
+
+        stats = metrics.stats()['endpoints']['Example']
+
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['buckets_ms']['5'], 1)
+        self.assertEqual(stats['buckets_ms']['250'], 1)
+        self.assertEqual(stats['buckets_ms']['inf'], 1)
+        self.assertEqual(stats['p50_ms'], 250)
+        self.assertIsNone(stats['p99_ms'])
+
+    def test_increment_is_one_round_trip(self):
+        """Test a counter that exists is bumped with a single incr()."""
+        cache = caches['default']
+        metrics.increment('example')
+        self.addCleanup(metrics._counters.discard, 'example')
+
+        with patch.object(cache, 'add') as add, patch.object(cache, 'incr') as incr:
+            metrics.increment('example', 2)
+
+        add.assert_not_called()
+        incr.assert_called_once_with('metrics:example', 2)
+        metrics.increment('example')
+        self.assertEqual(metrics.stats()['counters']['example'], 2)
+
+    def test_metrics_view(self):
+        """Test admins can read per-endpoint latencies."""
+        admin = get_user_model().objects.create_superuser('admin@example.com', 'testpass123')
+        self.client.post(CREATE_USER_URL, {
+            'email': 'user@example.com', 'password': 'testpass123', 'name': 'User',
+        })
+        self.client.force_authenticate(admin)
+        self.client.get(RECIPES_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['endpoints']['CreateUserView']['count'], 1)
+        self.assertIn('CreateTokenView', res.data['endpoints'])
+        # Cached reads are not slowed down by metrics.
+        self.assertNotIn('RecipeViewSet', res.data['endpoints'])
+        self.assertIn('pending', res.data['hashing_pool'])
+
+    def test_metrics_view_admin_only(self):
+        """Test other users cannot read metrics."""
+        user = get_user_model().objects.create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(user)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,86 @@
+"""
+Tests for the compression middleware.
+"""
+import gzip
+from unittest import skipIf
+from unittest.mock import patch
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from core import middleware
+from core.middleware import CompressionMiddleware
+
+BODY = b'{"title": "Sample recipe"}' * 100
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    """Test response compression."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept_encoding='gzip, deflate'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    @patch.object(middleware, 'brotli', None)
+    def test_gzip_response(self):
+        """Test large JSON responses are gzipped."""
+        response = HttpResponse(BODY, content_type='application/json')
+        response['ETag'] = '"abc"'
+
+        response = self.process(response)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_response_not_compressed(self):
+        """Test bodies under the size threshold are left alone."""
+        response = self.process(HttpResponse(b'{}', content_type='application/json'))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_content_type_not_allowed(self):
+        """Test content types outside the allowlist are left alone."""
+        response = self.process(HttpResponse(BODY, content_type='image/png'))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_not_accepted(self):
+        """Test nothing is compressed when the client does not accept it."""
+        for accept_encoding in ['', 'identity', 'gzip;q=0']:
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.process(
+                    HttpResponse(BODY, content_type='application/json'),
+                    accept_encoding,
+                )
+
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+    @patch.object(middleware, 'brotli', None)
+    def test_streaming_response(self):
+        """Test streaming responses are compressed chunk by chunk."""
+        chunks = [b'{"id": %d}\n' % i for i in range(1000)]
+        response = self.process(
+            StreamingHttpResponse(iter(chunks), content_type='application/x-ndjson'),
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)), b''.join(chunks),
+        )
+
+    @skipIf(middleware.brotli is None, 'brotli is not installed.')
+    def test_brotli_preferred(self):
+        """Test brotli is used when accepted and available."""
+        response = self.process(
+            HttpResponse(BODY, content_type='application/json'), 'gzip, br',
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(middleware.brotli.decompress(response.content), BODY)
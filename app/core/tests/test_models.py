@@ -3,7 +3,9 @@ Tests for models.
 """
 
 from decimal import Decimal
+from unittest import skipUnless
 
+from django.db import connection
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -71,4 +73,51 @@ class ModelTests(TestCase):
             description = 'Sample recipe description.',
         )
 
-        self.assertEqual(str(recipe) , recipe.title)
\ No newline at end of file
+        self.assertEqual(str(recipe) , recipe.title)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN output is Postgres specific.')
+class RecipeIndexTests(TestCase):
+    """Test the query plan of the recipe list query."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('user@example.com', 'pass123')
+        other = get_user_model().objects.create_user('other@example.com', 'pass123')
+        models.Recipe.objects.bulk_create(
+            models.Recipe(
+                user=other if i % 50 else self.user,
+                title=f'Recipe {i}',
+                time_minutes=i % 120,
+                price=Decimal(i % 900) / 10,
+            )
+            for i in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE core_recipe')
+            # On a table this small the planner may prefer a bitmap heap scan
+            # plus sort; rule it out to check the index can supply the order.
+            cursor.execute('SET LOCAL enable_bitmapscan = off')
+
+    def test_list_query_uses_user_id_index(self):
+        """Test listing a user's recipes is ordered by the index, not a sort."""
+        plan = models.Recipe.objects.filter(user=self.user).order_by('-id').explain()
+
+        self.assertIn('recipe_user_id_desc_idx', plan)
+        self.assertNotIn('Sort', plan)
+
+    def test_filtered_ordering_uses_index(self):
+        """Test range filters and orderings are served by composite indexes."""
+        cases = [
+            ({'price__lte': 20}, ['price', 'id'], 'recipe_user_price_idx'),
+            ({'price__lte': 20}, ['-price', '-id'], 'recipe_user_price_idx'),
+            ({'time_minutes__lte': 30}, ['time_minutes', 'id'], 'recipe_user_time_idx'),
+            ({}, ['title', 'id'], 'recipe_user_title_idx'),
+        ]
+        for filters, ordering, index in cases:
+            with self.subTest(ordering=ordering):
+                plan = models.Recipe.objects.filter(
+                    user=self.user, **filters,
+                ).order_by(*ordering).explain()
+
+                self.assertIn(index, plan)
+                self.assertNotIn('Sort', plan)
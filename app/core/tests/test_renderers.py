@@ -0,0 +1,85 @@
+"""
+Tests for the JSON renderer and parser.
+"""
+import io
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+from uuid import UUID
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Test FastJSONRenderer matches JSONRenderer."""
+
+    def assertRendersIdentically(self, data, *args):
+        self.assertEqual(
+            FastJSONRenderer().render(data, *args),
+            JSONRenderer().render(data, *args),
+        )
+
+    def test_identical_output(self):
+        """Test values render to the same bytes as DRF's renderer."""
+        samples = [
+            [OrderedDict([('id', 1), ('title', 'Soup'), ('price', '5.25')])],
+            {'price': Decimal('5.50'), 'ratio': 0.1, 'big': 2 ** 70},
+            {
+                'utc': datetime(2023, 7, 22, 8, 3, 1, 5, tzinfo=timezone.utc),
+                'offset': datetime(2023, 7, 22, 8, 3, tzinfo=timezone(timedelta(hours=5))),
+                'naive': datetime(2023, 7, 22, 8, 3),
+                'date': date(2023, 7, 22),
+                'time': time(8, 3),
+                'duration': timedelta(minutes=5),
+            },
+            {'uuid': UUID(int=1), 'lazy': gettext_lazy('Invalid token.')},
+            {1: 'int key', 'text': 'café     "quoted"'},
+            None,
+        ]
+        for data in samples:
+            with self.subTest(data=data):
+                self.assertRendersIdentically(data)
+
+    def test_indent_uses_stdlib(self):
+        """Test indented output matches DRF's renderer."""
+        self.assertRendersIdentically({'a': [1, 2]}, 'application/json; indent=4')
+
+    @patch('core.renderers.orjson', None)
+    def test_without_orjson(self):
+        """Test the renderer works when orjson is not installed."""
+        self.assertRendersIdentically({'price': Decimal('5.50')})
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """Test FastJSONParser matches JSONParser."""
+
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body))
+
+    def test_parse(self):
+        """Test JSON bodies parse to the same data."""
+        for body in [b'{"title": "Soup", "price": 5.25}', b'[1, 2]', '"café"'.encode(), b'1' + b'0' * 30]:
+            with self.subTest(body=body):
+                self.assertEqual(
+                    self.parse(FastJSONParser(), body),
+                    self.parse(JSONParser(), body),
+                )
+
+    def test_parse_errors(self):
+        """Test invalid bodies raise the same ParseError."""
+        for body in [b'{"title": ', b'', b'{"x": NaN}']:
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as fast:
+                    self.parse(FastJSONParser(), body)
+                with self.assertRaises(ParseError) as stdlib:
+                    self.parse(JSONParser(), body)
+
+                self.assertEqual(fast.exception.detail, stdlib.exception.detail)
@@ -0,0 +1,134 @@
+"""
+Tests for read-replica routing.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import routers
+from core.models import Recipe
+from core.routers import ReplicaRouter
+
+RECIPES_URL = reverse('recipe:recipe-list')
+EXPORT_URL = reverse('recipe:recipe-export')
+ME_URL = reverse('user:me')
+
+
+def replica_settings(aliases):
+    return override_settings(REPLICA_ROUTING={
+        'ALIASES': aliases,
+        'STICKY_SECONDS': 5,
+        'CACHE_ALIAS': 'default',
+    })
+
+
+@replica_settings(['replica1', 'replica2'])
+class ReplicaRouterTests(SimpleTestCase):
+    """Test the database router."""
+
+    def test_reads_use_primary_by_default(self):
+        """Test reads outside replica_reads() go to the primary."""
+        router = ReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(Recipe))
+        self.assertEqual(router.db_for_write(Recipe), 'default')
+
+    def test_replica_reads(self):
+        """Test reads inside replica_reads() go to a replica."""
+        router = ReplicaRouter()
+
+        with routers.replica_reads():
+            self.assertIn(router.db_for_read(Recipe), ['replica1', 'replica2'])
+            self.assertEqual(router.db_for_write(Recipe), 'default')
+
+        self.assertIsNone(router.db_for_read(Recipe))
+
+    def test_migrations_on_primary_only(self):
+        """Test replicas are never migrated."""
+        router = ReplicaRouter()
+
+        self.assertTrue(router.allow_migrate('default', 'core'))
+        self.assertFalse(router.allow_migrate('replica1', 'core'))
+
+
+# The "replica" is the primary itself, so queries succeed while the router's
+# choices are recorded.
+@replica_settings(['default'])
+class ReplicaReadMixinTests(TestCase):
+    """Test which requests read from a replica."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.reads = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            alias = db_for_read(router, model, **hints)
+            self.reads.append(alias)
+            return alias
+
+        patcher = patch.object(ReplicaRouter, 'db_for_read', record)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_list_reads_from_replica(self):
+        """Test the recipe list is read from a replica."""
+        self.client.get(RECIPES_URL)
+
+        self.assertTrue(self.reads)
+        self.assertEqual(set(self.reads), {'default'})
+
+    def test_flag_reset_after_uncaught_error(self):
+        """Test a replica error escaping the view does not leave reads on a replica."""
+        self.client.raise_request_exception = True
+        with patch('recipe.views.RecipeViewSet.list', side_effect=OperationalError):
+            with self.assertRaises(OperationalError):
+                self.client.get(RECIPES_URL)
+
+        self.assertFalse(routers._use_replica.get())
+
+    def test_read_your_writes(self):
+        """Test reads after a write use the primary until the pin expires."""
+        self.client.post(RECIPES_URL, {'title': 'Soup', 'time_minutes': 5, 'price': '1.00'})
+        self.reads.clear()
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(set(self.reads), {None})
+
+        caches['default'].clear()
+        self.reads.clear()
+        self.client.get(RECIPES_URL)
+
+        self.assertEqual(set(self.reads), {'default'})
+
+    def test_other_actions_use_primary(self):
+        """Test actions outside replica_actions read from the primary."""
+        Recipe.objects.create(user=self.user, title='Soup', time_minutes=5, price='1.00')
+        self.reads.clear()
+
+        b''.join(self.client.get(EXPORT_URL).streaming_content)
+
+        self.assertEqual(set(self.reads), {None})
+
+    def test_no_replicas(self):
+        """Test nothing is routed or pinned without replicas."""
+        with replica_settings([]):
+            self.client.patch(ME_URL, {'name': 'New name'})
+            self.client.get(RECIPES_URL)
+
+        self.assertEqual(set(self.reads), {None})
+        self.assertFalse(routers.is_pinned(self.user.pk))
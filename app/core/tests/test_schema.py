@@ -0,0 +1,61 @@
+"""
+Tests for the precomputed OpenAPI schema.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from core import schema
+
+SCHEMA_URL = reverse('api-schema')
+
+
+class PrecomputedSchemaTests(SimpleTestCase):
+    """Test serving the schema from memory or disk."""
+
+    def setUp(self):
+        schema.clear()
+        self.addCleanup(schema.clear)
+
+    def test_schema_generated_once(self):
+        """Test the schema is generated on the first request only."""
+        with patch('core.schema.generate', wraps=schema.generate) as generate:
+            res1 = self.client.get(SCHEMA_URL)
+            res2 = self.client.get(SCHEMA_URL, HTTP_ACCEPT='application/vnd.oai.openapi+json')
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(res1['Content-Type'], 'application/vnd.oai.openapi')
+        self.assertIn(b'openapi:', res1.content)
+        self.assertIn('/api/recipe/recipes/', json.loads(res2.content)['paths'])
+        self.assertNotEqual(res1['ETag'], res2['ETag'])
+
+    def test_not_modified(self):
+        """Test a matching If-None-Match gets a 304 without a body."""
+        etag = self.client.get(SCHEMA_URL)['ETag']
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b'')
+
+    def test_generate_schema_command(self):
+        """Test the schema is served from the files the command writes."""
+        with tempfile.TemporaryDirectory() as directory:
+            call_command('generate_schema', dir=directory, stdout=StringIO())
+            with open(os.path.join(directory, 'schema.yaml'), 'wb') as schema_file:
+                schema_file.write(b'openapi: 3.0.3\n')
+
+            with override_settings(API_SCHEMA={'DIR': directory}), \
+                    patch('core.schema.generate') as generate:
+                res = self.client.get(SCHEMA_URL)
+                res_json = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        generate.assert_not_called()
+        self.assertEqual(res.content, b'openapi: 3.0.3\n')
+        self.assertIn('paths', json.loads(res_json.content))
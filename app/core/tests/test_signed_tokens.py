@@ -0,0 +1,201 @@
+"""
+Tests for stateless signed tokens.
+"""
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from core import signed_tokens, throttling
+from core.models import Recipe
+
+TOKEN_URL = reverse('user:token')
+REFRESH_URL = reverse('user:token-refresh')
+ME_URL = reverse('user:me')
+RECIPES_URL = reverse('recipe:recipe-list')
+
+SIGNED = {'ENABLED': True, 'SIGNING_KEY': 'test-key', 'ACCESS_TTL': 300, 'REFRESH_TTL': 3600}
+signed = override_settings(SIGNED_TOKENS=SIGNED)
+
+
+@signed
+class SignedTokenTests(TestCase):
+    """Test issuing and verifying signed tokens."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+
+    def test_access_token_round_trip(self):
+        """Test an access token carries the user id."""
+        tokens = signed_tokens.issue(self.user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(signed_tokens.verify_access(tokens['access']), self.user.pk)
+        self.assertEqual(tokens['expires_in'], 300)
+
+    def test_tampered_token_rejected(self):
+        """Test a modified token or one of the wrong kind is rejected."""
+        tokens = signed_tokens.issue(self.user)
+        _, rest = tokens['access'].split(':', 1)
+
+        for token in [f'{self.user.pk + 1}:{rest}', tokens['refresh'], 'garbage']:
+            with self.assertRaisesMessage(AuthenticationFailed, 'Invalid token'):
+                signed_tokens.verify_access(token)
+        with self.assertRaisesMessage(AuthenticationFailed, 'Invalid token'):
+            signed_tokens.verify_refresh(tokens['access'])
+
+    def test_secret_key_does_not_sign(self):
+        """Test a token signed with SECRET_KEY instead of SIGNING_KEY is rejected."""
+        token = signing.TimestampSigner(salt=signed_tokens.ACCESS_SALT).sign(str(self.user.pk))
+
+        with self.assertRaisesMessage(AuthenticationFailed, 'Invalid token'):
+            signed_tokens.verify_access(token)
+
+    def test_signing_key_required(self):
+        """Test tokens are neither issued nor verified without a SIGNING_KEY."""
+        with self.settings(SIGNED_TOKENS={**SIGNED, 'SIGNING_KEY': None}):
+            with self.assertRaises(ImproperlyConfigured):
+                signed_tokens.issue(self.user)
+
+    def test_access_token_expires(self):
+        """Test an access token is rejected after ACCESS_TTL."""
+        tokens = signed_tokens.issue(self.user)
+
+        with patch('django.core.signing.time.time', return_value=time.time() + 301):
+            with self.assertRaisesMessage(AuthenticationFailed, 'expired'):
+                signed_tokens.verify_access(tokens['access'])
+
+    def test_refresh_revoked_by_password_change(self):
+        """Test changing the password or deactivating revokes refresh tokens."""
+        tokens = signed_tokens.issue(self.user)
+        self.assertEqual(signed_tokens.verify_refresh(tokens['refresh']), self.user)
+
+        self.user.set_password('newpass123')
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            signed_tokens.verify_refresh(tokens['refresh'])
+
+        tokens = signed_tokens.issue(self.user)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            signed_tokens.verify_refresh(tokens['refresh'])
+
+
+@signed
+class SignedTokenApiTests(TestCase):
+    """Test the API with signed tokens."""
+
+    def setUp(self):
+        throttling.clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+        self.client = APIClient()
+        res = self.client.post(TOKEN_URL, {'email': 'user@example.com', 'password': 'testpass123'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.tokens = res.data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    def test_recipe_requests_run_no_auth_queries(self):
+        """Test signed tokens are authenticated without touching users or tokens."""
+        Recipe.objects.create(user=self.user, title='Soup', time_minutes=5, price=Decimal('1.00'))
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+        for query in queries:
+            self.assertNotIn('core_user', query['sql'])
+            self.assertNotIn('authtoken_token', query['sql'])
+
+    def test_create_recipe(self):
+        """Test objects created with a signed token belong to its user."""
+        payload = {'title': 'Soup', 'time_minutes': 5, 'price': '1.00'}
+
+        res = self.client.post(RECIPES_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Recipe.objects.get(id=res.data['id']).user, self.user)
+
+    def test_deleted_user(self):
+        """Test the access token of a deleted user reads nothing and cannot write."""
+        Recipe.objects.create(user=self.user, title='Soup', time_minutes=5, price=Decimal('1.00'))
+        self.user.delete()
+
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 0)
+
+        payload = {'title': 'Soup', 'time_minutes': 5, 'price': '1.00'}
+        res = self.client.post(RECIPES_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.patch(ME_URL, {'name': 'New'}).status_code, 401)
+
+    def test_signed_tokens_rejected_when_disabled(self):
+        """Test access tokens are not accepted while signed tokens are off."""
+        with self.settings(SIGNED_TOKENS={**SIGNED, 'ENABLED': False}):
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_me(self):
+        """Test the user endpoint loads the user of a signed token."""
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], 'user@example.com')
+
+    def test_refresh(self):
+        """Test a refresh token is exchanged for new tokens."""
+        res = APIClient().post(REFRESH_URL, {'refresh': self.tokens['refresh']})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(signed_tokens.verify_access(res.data['access']), self.user.pk)
+        self.assertIn('refresh', res.data)
+
+    def test_refresh_rejects_access_token(self):
+        """Test an access token cannot be used to refresh."""
+        res = APIClient().post(REFRESH_URL, {'refresh': self.tokens['access']})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_refresh_disabled(self):
+        """Test the refresh endpoint is not found when signed tokens are off."""
+        with self.settings(SIGNED_TOKENS={**SIGNED, 'ENABLED': False}):
+            res = APIClient().post(REFRESH_URL, {'refresh': self.tokens['refresh']})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_refresh_throttled_per_ip(self):
+        """Test guessing refresh tokens is throttled by client IP."""
+        client = APIClient()
+        with patch.dict(throttling.SlidingWindowRateThrottle.THROTTLE_RATES, refresh_ip='2/min'):
+            codes = [
+                client.post(REFRESH_URL, {'refresh': 'guess'}).status_code for _ in range(3)
+            ]
+
+        self.assertEqual(codes, [400, 400, 429])
+
+    def test_database_tokens_still_accepted(self):
+        """Test database tokens keep working when signed tokens are enabled."""
+        with self.settings(SIGNED_TOKENS={**SIGNED, 'ENABLED': False}):
+            res = APIClient().post(TOKEN_URL, {'email': 'user@example.com', 'password': 'testpass123'})
+        self.assertEqual(set(res.data), {'token'})
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {res.data['token']}")
+        self.assertEqual(client.get(RECIPES_URL).status_code, status.HTTP_200_OK)
@@ -0,0 +1,192 @@
+"""
+Tests for the sliding-window throttles.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core import throttling
+from core.parsers import FastJSONParser
+
+TOKEN_URL = reverse('user:token')
+CREATE_USER_URL = reverse('user:create')
+
+
+def rates(**values):
+    return patch.dict(throttling.SlidingWindowRateThrottle.THROTTLE_RATES, values)
+
+
+def frozen_timer(now):
+    return patch.object(throttling.SlidingWindowRateThrottle, 'timer', Mock(return_value=now))
+
+
+class View:
+    throttle_scope = 'test'
+
+
+class SlidingWindowTests(SimpleTestCase):
+    """Test the sliding-window counter."""
+
+    def setUp(self):
+        throttling.clear()
+        self.addCleanup(throttling.clear)
+
+    def _allow(self, throttle_class=throttling.IPRateThrottle, request=None):
+        request = Request(
+            request or APIRequestFactory().post('/', {'email': 'User@Example.com'}),
+            parsers=[FastJSONParser(), FormParser(), MultiPartParser()],
+        )
+        throttle = throttle_class()
+        return throttle.allow_request(request, View()), throttle
+
+    @rates(test_ip='100/min')
+    def test_burst_allows_exactly_the_limit(self):
+        """Test a concurrent burst is cut off at exactly the rate."""
+        with ThreadPoolExecutor(max_workers=50) as executor:
+            results = list(executor.map(lambda _: self._allow()[0], range(500)))
+
+        self.assertEqual(results.count(True), 100)
+
+    @rates(test_ip='10/min')
+    def test_previous_window_slides_out(self):
+        """Test requests of the previous window count for its remaining share."""
+        with frozen_timer(1200 + 50):
+            for _ in range(10):
+                self.assertTrue(self._allow()[0])
+            allowed, throttle = self._allow()
+            self.assertFalse(allowed)
+            self.assertAlmostEqual(throttle.wait(), 10 + 6, places=3)
+
+        # 15s into the next window, 75% of the previous 10 still count.
+        with frozen_timer(1260 + 15):
+            for _ in range(3):
+                self.assertTrue(self._allow()[0])
+            allowed, throttle = self._allow()
+            self.assertFalse(allowed)
+            self.assertAlmostEqual(throttle.wait(), 9, places=3)
+
+        with frozen_timer(1260 + 24):
+            self.assertTrue(self._allow()[0])
+
+        # Two windows later nothing counts.
+        with frozen_timer(1380):
+            for _ in range(10):
+                self.assertTrue(self._allow()[0])
+
+    @rates(test_email='2/min')
+    def test_email_is_normalized(self):
+        """Test the email throttle ignores case and surrounding spaces."""
+        factory = APIRequestFactory()
+        for email in ['user@example.com', ' USER@example.com ']:
+            self.assertTrue(self._allow(
+                throttling.EmailRateThrottle, factory.post('/', {'email': email}),
+            )[0])
+
+        allowed, throttle = self._allow(throttling.EmailRateThrottle)
+        self.assertFalse(allowed)
+        self.assertNotIn('example', throttle.key)
+        self.assertTrue(self._allow(
+            throttling.EmailRateThrottle, factory.post('/', {'email': 'other@example.com'}),
+        )[0])
+
+    @rates(test_email='1/min')
+    def test_missing_email_is_not_throttled(self):
+        """Test requests without an email are left to the IP throttle."""
+        request = APIRequestFactory().post('/', {})
+        for _ in range(3):
+            self.assertTrue(self._allow(throttling.EmailRateThrottle, request)[0])
+
+    @override_settings(THROTTLING={'CACHE_ALIAS': None, 'MAX_KEYS': 2})
+    @rates(test_ip='1/min')
+    def test_local_store_is_bounded(self):
+        """Test the in-process store keeps at most MAX_KEYS counters."""
+        factory = APIRequestFactory()
+        for address in ['10.0.0.1', '10.0.0.2', '10.0.0.3']:
+            self._allow(request=factory.post('/', REMOTE_ADDR=address))
+
+        store = throttling.get_store(60)
+        self.assertEqual(len(store._counts), 2)
+
+    @override_settings(THROTTLING={'CACHE_ALIAS': 'default', 'MAX_KEYS': 100})
+    @rates(test_ip='100/min')
+    def test_cache_store_burst(self):
+        """Test counters kept in a Django cache cut a burst off at the rate."""
+        caches['default'].clear()
+        self.assertIsInstance(throttling.get_store(60), throttling.CacheWindowStore)
+
+        with ThreadPoolExecutor(max_workers=50) as executor:
+            results = list(executor.map(lambda _: self._allow()[0], range(500)))
+
+        self.assertEqual(results.count(True), 100)
+        with frozen_timer(10 ** 9):
+            self.assertTrue(self._allow()[0])
+
+
+@rates(login_ip='5/min', login_email='3/min', signup_ip='4/hour', signup_email='2/hour')
+class ThrottledUserApiTests(TestCase):
+    """Test throttling of login and signup."""
+
+    def setUp(self):
+        throttling.clear()
+        self.addCleanup(throttling.clear)
+        self.client = APIClient()
+        get_user_model().objects.create_user(email='user@example.com', password='testpass123')
+
+    def test_login_throttled_per_email(self):
+        """Test repeated logins to one account are throttled with Retry-After."""
+        payload = {'email': 'user@example.com', 'password': 'wrong'}
+        for _ in range(3):
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(TOKEN_URL, {**payload, 'password': 'testpass123'})
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(res['Retry-After']), 0)
+
+    def test_login_throttled_per_ip(self):
+        """Test one client cycling through emails is throttled by IP."""
+        for index in range(5):
+            res = self.client.post(TOKEN_URL, {'email': f'user{index}@example.com', 'password': 'x'})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(TOKEN_URL, {'email': 'user@example.com', 'password': 'testpass123'})
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        other = APIClient(REMOTE_ADDR='10.0.0.2')
+        res = other.post(TOKEN_URL, {'email': 'user@example.com', 'password': 'testpass123'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_forwarded_for_does_not_bypass_ip_limit(self):
+        """Test rotating X-Forwarded-For values still counts against REMOTE_ADDR."""
+        codes = [
+            self.client.post(
+                TOKEN_URL, {'email': f'user{index}@example.com', 'password': 'x'},
+                HTTP_X_FORWARDED_FOR=f'10.1.0.{index}',
+            ).status_code
+            for index in range(6)
+        ]
+
+        self.assertEqual(codes.count(status.HTTP_400_BAD_REQUEST), 5)
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_signup_burst(self):
+        """Test a burst of signups from one client stops at the IP rate."""
+        codes = [
+            self.client.post(CREATE_USER_URL, {
+                'email': f'new{index}@example.com', 'password': 'testpass123', 'name': 'New',
+            }).status_code
+            for index in range(10)
+        ]
+
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), 4)
+        self.assertEqual(codes.count(status.HTTP_429_TOO_MANY_REQUESTS), 6)
+        self.assertEqual(get_user_model().objects.filter(email__startswith='new').count(), 4)
@@ -0,0 +1,213 @@
+"""
+Tests for expiring auth tokens.
+"""
+import importlib
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from core import throttling, tokens
+from core.authentication import CachedTokenAuthentication, get_token_cache
+from core.models import TokenActivity
+
+TOKEN_URL = reverse('user:token')
+DAY = 24 * 60 * 60
+
+expiry = override_settings(TOKEN_EXPIRY={'IDLE_TIMEOUT': DAY, 'FLUSH_INTERVAL': 0})
+
+
+def create_token(email='user@example.com', idle=0):
+    """Create and return a token last used idle seconds ago."""
+    user = get_user_model().objects.create_user(email=email, password='testpass123')
+    token = Token.objects.create(user=user)
+    if idle:
+        Token.objects.filter(pk=token.pk).update(
+            created=timezone.now() - timedelta(seconds=idle),
+        )
+    return token
+
+
+@expiry
+class LastSeenTrackerTests(TestCase):
+    """Test batched writes of token uses."""
+
+    def test_flush_writes_latest_use(self):
+        """Test uses are coalesced and written in one flush."""
+        token = create_token()
+        tracker = tokens.get_tracker()
+        now = timezone.now()
+        tracker.touch(token.key, now - timedelta(minutes=1))
+        tracker.touch(token.key, now)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(tracker.flush(), 1)
+
+        self.assertEqual(TokenActivity.objects.get(token=token).last_seen, now)
+        self.assertIsNone(tracker.get(token.key))
+        with self.assertNumQueries(0):
+            self.assertEqual(tracker.flush(), 0)
+
+    def test_flush_keeps_newest_time(self):
+        """Test an older use flushed by another process does not win."""
+        token = create_token()
+        now = timezone.now()
+        TokenActivity.objects.create(token=token, last_seen=now)
+        tracker = tokens.get_tracker()
+        tracker.touch(token.key, now - timedelta(minutes=5))
+        tracker.touch('deleted-token', now)
+
+        tracker.flush()
+
+        self.assertEqual(TokenActivity.objects.get(token=token).last_seen, now)
+        self.assertEqual(TokenActivity.objects.count(), 1)
+
+
+@expiry
+class TokenExpiryTests(TestCase):
+    """Test expiring token authentication."""
+
+    def setUp(self):
+        get_token_cache().clear()
+        self.auth = CachedTokenAuthentication()
+
+    def test_idle_token_rejected(self):
+        """Test a token unused for longer than IDLE_TIMEOUT is rejected."""
+        token = create_token(idle=DAY + 60)
+
+        with self.assertRaisesMessage(AuthenticationFailed, 'expired'):
+            self.auth.authenticate_credentials(token.key)
+
+    def test_use_renews_token(self):
+        """Test a use recorded in memory or in the database keeps a token alive."""
+        token = create_token(idle=DAY - 60)
+        self.auth.authenticate_credentials(token.key)
+        self.assertIsNotNone(tokens.get_tracker().get(token.key))
+
+        later = timezone.now() + timedelta(seconds=120)
+        cached = get_token_cache().get(token.key)[1]
+        self.assertFalse(tokens.is_expired(cached, now=later))
+
+        tokens.get_tracker().flush()
+        self.assertFalse(tokens.is_expired(
+            Token.objects.select_related('activity').get(pk=token.pk), now=later,
+        ))
+
+    def test_stale_cache_checked_against_database(self):
+        """Test a cached token that looks expired is re-read before rejecting."""
+        token = create_token(idle=DAY - 60)
+        self.auth.authenticate_credentials(token.key)
+        tokens.get_tracker().flush()
+        # Cached before the flush, so the cached copy has no activity.
+        get_token_cache().set(token.key, (token.user, Token.objects.get(pk=token.pk)))
+        Token.objects.filter(pk=token.pk).update(created=timezone.now() - timedelta(days=2))
+
+        user, _ = self.auth.authenticate_credentials(token.key)
+
+        self.assertEqual(user, token.user)
+
+    def test_cached_lookup_is_read_only(self):
+        """Test authenticating a cached token runs no queries."""
+        token = create_token()
+        self.auth.authenticate_credentials(token.key)
+
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(token.key)
+
+    @override_settings(TOKEN_EXPIRY={'IDLE_TIMEOUT': 0, 'FLUSH_INTERVAL': 0})
+    def test_expiry_disabled(self):
+        """Test IDLE_TIMEOUT=0 keeps tokens forever."""
+        token = create_token(idle=365 * DAY)
+
+        user, _ = self.auth.authenticate_credentials(token.key)
+
+        self.assertEqual(user, token.user)
+
+
+@expiry
+class TokenRotationApiTests(TestCase):
+    """Test the token endpoint issues a new key for expired tokens."""
+
+    def setUp(self):
+        throttling.clear()
+        self.client = APIClient()
+        self.payload = {'email': 'user@example.com', 'password': 'testpass123'}
+
+    def test_fresh_token_reused(self):
+        """Test logging in again returns the same live token."""
+        token = create_token()
+
+        res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['token'], token.key)
+
+    def test_expired_token_rotated(self):
+        """Test logging in with an expired token issues a new key."""
+        token = create_token(idle=DAY + 60)
+
+        res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data['token'], token.key)
+        self.assertFalse(Token.objects.filter(pk=token.pk).exists())
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {res.data['token']}")
+        self.assertEqual(self.client.get(reverse('user:me')).status_code, status.HTTP_200_OK)
+
+
+@expiry
+class TokenActivityMigrationTests(TestCase):
+    """Test existing tokens survive the deploy that adds expiry."""
+
+    def test_existing_tokens_marked_active(self):
+        """Test the migration records every existing token as used now."""
+        migration = importlib.import_module('core.migrations.0007_tokenactivity')
+        existing = [create_token(f'user{index}@example.com', idle=30 * DAY) for index in range(3)]
+
+        migration.create_activity(apps, SimpleNamespace(connection=connection))
+
+        self.assertEqual(TokenActivity.objects.count(), 3)
+        for token in existing:
+            self.assertFalse(tokens.is_expired(
+                Token.objects.select_related('activity').get(pk=token.pk),
+            ))
+
+
+@expiry
+class PruneTokensCommandTests(TestCase):
+    """Test the prune_tokens command."""
+
+    def test_prune_expired_tokens(self):
+        """Test expired tokens are deleted in batches and live ones kept."""
+        expired = [create_token(f'old{index}@example.com', idle=DAY + 60) for index in range(3)]
+        live = create_token('new@example.com', idle=DAY + 60)
+        TokenActivity.objects.create(token=live, last_seen=timezone.now())
+        renewed_earlier = create_token('renewed@example.com', idle=2 * DAY)
+        TokenActivity.objects.create(
+            token=renewed_earlier, last_seen=timezone.now() - timedelta(hours=1),
+        )
+        TokenActivity.objects.create(
+            token=expired[0], last_seen=timezone.now() - timedelta(days=2),
+        )
+
+        out = StringIO()
+        call_command('prune_tokens', '--dry-run', stdout=out)
+        self.assertIn('3 expired tokens', out.getvalue())
+
+        call_command('prune_tokens', '--batch-size', '2', stdout=out)
+
+        self.assertIn('Deleted 3 expired tokens', out.getvalue())
+        self.assertEqual(
+            set(Token.objects.values_list('pk', flat=True)), {live.pk, renewed_earlier.pk},
+        )
@@ -0,0 +1,198 @@
+"""
+Sliding-window rate throttles for the login and signup APIs.
+
+DRF's SimpleRateThrottle stores a timestamp per request and rewrites the
+whole list on every check, so a check costs O(rate). These throttles keep
+two counters per key instead, for the current and the previous fixed
+window, and weight the previous one by how much of it the sliding window
+still covers. Each check is O(1) in time and memory.
+
+Counters live in a bounded per-process LRU, or in the Django cache named by
+``THROTTLING['CACHE_ALIAS']`` so that limits hold across processes.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.throttling import SimpleRateThrottle
+
+from core.cache import LRUCache
+
+
+class LocalWindowStore:
+    """Window counters of one duration, kept in this process."""
+
+    def __init__(self, duration, max_size):
+        self.duration = duration
+        self._counts = LRUCache(max_size, ttl=2 * duration)
+        self._lock = threading.Lock()
+
+    def acquire(self, key, window, fraction, limit):
+        """Count a request unless over limit; return (allowed, previous, current)."""
+        with self._lock:
+            counts = self._counts.get(key)
+            previous, current = _shift(counts, window)
+            if previous * (1 - fraction) + current >= limit:
+                return False, previous, current
+
+            self._counts.set(key, (window, previous, current + 1))
+            return True, previous, current + 1
+
+    def clear(self):
+        """Forget every counter."""
+        self._counts.clear()
+
+
+class CacheWindowStore:
+    """Window counters of one duration, kept in a Django cache."""
+    key_prefix = 'throttle:'
+
+    def __init__(self, duration, cache_alias):
+        self.duration = duration
+        self.cache_alias = cache_alias
+
+    def acquire(self, key, window, fraction, limit):
+        """Count a request unless over limit; return (allowed, previous, current)."""
+        cache = caches[self.cache_alias]
+        current_key = f'{self.key_prefix}{key}:{window}'
+        # Count first: incr() is atomic, so concurrent requests each see
+        # their own position and the limit holds exactly.
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            if cache.add(current_key, 1, 2 * self.duration):
+                current = 1
+            else:
+                current = cache.incr(current_key)
+        previous = cache.get(f'{self.key_prefix}{key}:{window - 1}', 0)
+
+        if previous * (1 - fraction) + current - 1 >= limit:
+            # Rejected requests do not count.
+            cache.decr(current_key)
+            return False, previous, current - 1
+        return True, previous, current
+
+    def clear(self):
+        """Counters expire on their own in the shared cache."""
+
+
+def _shift(counts, window):
+    """Return (previous, current) counts as seen from window."""
+    if counts is None:
+        return 0, 0
+
+    stored_window, previous, current = counts
+    if stored_window == window:
+        return previous, current
+    if stored_window == window - 1:
+        return current, 0
+    return 0, 0
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(duration):
+    """Return the process-wide counter store for a window duration."""
+    store = _stores.get(duration)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(duration)
+            if store is None:
+                config = settings.THROTTLING
+                if config.get('CACHE_ALIAS'):
+                    store = CacheWindowStore(duration, config['CACHE_ALIAS'])
+                else:
+                    store = LocalWindowStore(duration, config['MAX_KEYS'])
+                _stores[duration] = store
+    return store
+
+
+def clear():
+    """Forget all counters kept in this process."""
+    with _stores_lock:
+        for store in _stores.values():
+            store.clear()
+        _stores.clear()
+
+
+@receiver(setting_changed)
+def reset_stores(setting, **kwargs):
+    """Rebuild the stores when their settings change."""
+    if setting == 'THROTTLING':
+        clear()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle with an O(1) sliding-window counter."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        window, offset = divmod(self.timer(), self.duration)
+        self.fraction = offset / self.duration
+        allowed, self.previous, self.current = get_store(self.duration).acquire(
+            self.key, int(window), self.fraction, self.num_requests,
+        )
+        return allowed
+
+    def wait(self):
+        """Return the seconds until the next request would be allowed."""
+        limit = self.num_requests
+        if self.current + 1 <= limit:
+            # Wait for enough of the previous window to slide out.
+            needed = 1 - (limit - self.current - 1) / self.previous
+            return max(0, (needed - self.fraction) * self.duration)
+
+        # Wait for the next window, then for this one to slide out enough.
+        needed = 1 - (limit - 1) / self.current
+        return (1 - self.fraction + needed) * self.duration
+
+
+class ViewScopedRateThrottle(SlidingWindowRateThrottle):
+    """Throttle views by ``throttle_scope``, using the rate '<scope>_<key_name>'."""
+    key_name = None
+
+    def __init__(self):
+        # The rate depends on the view, so it is looked up in allow_request().
+        pass
+
+    def allow_request(self, request, view):
+        throttle_scope = getattr(view, 'throttle_scope', None)
+        if not throttle_scope:
+            return True
+
+        self.scope = f'{throttle_scope}_{self.key_name}'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+
+class IPRateThrottle(ViewScopedRateThrottle):
+    """Limit requests per client IP address."""
+    key_name = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class EmailRateThrottle(ViewScopedRateThrottle):
+    """Limit requests per email address in the request body."""
+    key_name = 'email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email.strip():
+            return None
+
+        ident = hashlib.md5(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
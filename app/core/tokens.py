@@ -0,0 +1,181 @@
+"""
+Expiring auth tokens with batched "last seen" writes.
+
+A token expires once it has not been used for ``TOKEN_EXPIRY['IDLE_TIMEOUT']``
+seconds, so every use renews it. Writing the time of every use would add a
+write to every request, so uses are coalesced in memory per process and a
+background thread writes them in one statement every ``FLUSH_INTERVAL``
+seconds. Authentication itself stays read-only, and expiry is accurate to
+about FLUSH_INTERVAL. Expired tokens are deleted in bulk by the
+prune_tokens command.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DatabaseError, connections, router, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.models import TokenActivity
+
+logger = logging.getLogger(__name__)
+
+# Rows written per statement when flushing.
+FLUSH_BATCH_SIZE = 1000
+
+
+class LastSeenTracker:
+    """Coalesce token uses in memory and write them in bulk."""
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._flushing = {}
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def touch(self, key, when=None):
+        """Record a use of the token key."""
+        when = when or timezone.now()
+        with self._lock:
+            self._pending[key] = when
+        if self._pid != os.getpid():
+            self._start()
+
+    def get(self, key):
+        """Return the last use of key not yet written, or None."""
+        return self._pending.get(key) or self._flushing.get(key)
+
+    def flush(self):
+        """Write the recorded uses; return how many tokens were written."""
+        with self._lock:
+            self._flushing, self._pending = self._pending, {}
+        pending = self._flushing
+        try:
+            items = list(pending.items())
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                _write(items[start:start + FLUSH_BATCH_SIZE])
+        except DatabaseError:
+            logger.exception('Could not write token activity, retrying later.')
+            with self._lock:
+                for key, seen in pending.items():
+                    self._pending.setdefault(key, seen)
+            return 0
+        finally:
+            self._flushing = {}
+        return len(pending)
+
+    def _start(self):
+        """Start the flush thread, once per process."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        if self.flush_interval > 0:
+            threading.Thread(target=self._run, name='token-flush', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Token activity flush failed.')
+            finally:
+                # Do not hold a connection open between flushes.
+                connections.close_all()
+
+
+def _write(items):
+    """Upsert (key, last seen) pairs, skipping deleted tokens."""
+    table = TokenActivity._meta.db_table
+    token_table = Token._meta.db_table
+    values = ', '.join(['(%s, %s::timestamptz)'] * len(items))
+    params = [value for item in items for value in item]
+    alias = router.db_for_write(TokenActivity)
+    with connections[alias].cursor() as cursor:
+        # Keep the latest time when several processes saw the same token.
+        cursor.execute(
+            f'INSERT INTO {table} (token_id, last_seen) '
+            f'SELECT seen.key, seen.last_seen '
+            f'FROM (VALUES {values}) AS seen (key, last_seen) '
+            f'JOIN {token_table} ON {token_table}.key = seen.key '
+            f'ON CONFLICT (token_id) DO UPDATE '
+            f'SET last_seen = GREATEST({table}.last_seen, EXCLUDED.last_seen)',
+            params,
+        )
+
+
+_tracker = None
+
+
+def get_tracker():
+    """Return the process-wide last seen tracker."""
+    global _tracker
+    if _tracker is None:
+        _tracker = LastSeenTracker(settings.TOKEN_EXPIRY['FLUSH_INTERVAL'])
+    return _tracker
+
+
+@receiver(setting_changed)
+def reset_tracker(setting, **kwargs):
+    """Rebuild the tracker when its settings change."""
+    global _tracker
+    if setting == 'TOKEN_EXPIRY':
+        _tracker = None
+
+
+def last_seen(token):
+    """Return when token was last used, or created if never."""
+    try:
+        seen = token.activity.last_seen
+    except TokenActivity.DoesNotExist:
+        seen = token.created
+
+    pending = get_tracker().get(token.key)
+    return max(seen, pending) if pending else seen
+
+
+def is_expired(token, now=None):
+    """Return True if token has been idle for longer than IDLE_TIMEOUT."""
+    timeout = settings.TOKEN_EXPIRY['IDLE_TIMEOUT']
+    if not timeout:
+        return False
+
+    return last_seen(token) < (now or timezone.now()) - timedelta(seconds=timeout)
+
+
+def expired_tokens(now=None):
+    """Return the queryset of expired tokens."""
+    timeout = settings.TOKEN_EXPIRY['IDLE_TIMEOUT']
+    if not timeout:
+        return Token.objects.none()
+
+    cutoff = (now or timezone.now()) - timedelta(seconds=timeout)
+    return Token.objects.filter(activity__last_seen__lt=cutoff) | Token.objects.filter(
+        activity__isnull=True, created__lt=cutoff,
+    )
+
+
+def issue(user):
+    """Return the user's token, replacing it with a new key if expired."""
+    with transaction.atomic():
+        # Lock the token so concurrent logins do not both replace it.
+        token = Token.objects.select_for_update(of=('self',)).select_related(
+            'activity',
+        ).filter(user=user).first()
+        if token is None:
+            return Token.objects.get_or_create(user=user)[0]
+
+        if is_expired(token):
+            token.delete()
+            return Token.objects.create(user=user)
+
+    get_tracker().touch(token.key)
+    return token
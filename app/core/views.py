@@ -0,0 +1,50 @@
+"""
+Views for the core app.
+"""
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework import views
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from core import hashing, metrics, schema
+from core.authentication import CachedTokenAuthentication
+
+
+class PrecomputedSchemaView(SpectacularAPIView):
+    """Serve the precomputed OpenAPI schema as YAML or JSON.
+
+    The format is negotiated as in SpectacularAPIView. Requests for a
+    translated schema (``?lang=``) are still generated on demand.
+    """
+
+    def _get_schema_response(self, request):
+        if request.GET.get('lang'):
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        content, etag = schema.get_schema(renderer.format)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type=renderer.media_type)
+        response['ETag'] = etag
+
+        return response
+
+
+class MetricsView(views.APIView):
+    """Report request latencies and password hashing pool usage."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        """Return the metrics."""
+        return Response({
+            **metrics.stats(),
+            'hashing_pool': hashing.get_pool().stats(),
+        })
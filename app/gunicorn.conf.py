@@ -0,0 +1,69 @@
+"""
+Gunicorn configuration for serving app.wsgi in production.
+
+Gunicorn reads this file from the working directory. Worker and thread
+counts follow the CPUs available to the container unless WEB_CONCURRENCY
+and GUNICORN_THREADS are set. Every thread holds one persistent database
+connection, so DB_MAX_CONNECTIONS, when set, caps workers * threads.
+Workers share state through CACHES['default'], so scripts/run.sh refuses
+to start several of them without a shared CACHE_BACKEND.
+"""
+import math
+import multiprocessing
+import os
+
+
+def cpu_count():
+    """Return the CPUs this process may use, honouring cgroup quotas."""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = multiprocessing.cpu_count()
+
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != 'max':
+            count = min(count, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return count
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+worker_class = 'gthread' if threads > 1 else 'sync'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 * cpu_count() + 1))
+if os.environ.get('DB_MAX_CONNECTIONS'):
+    workers = max(1, min(workers, int(os.environ['DB_MAX_CONNECTIONS']) // threads))
+
+# Import the app once in the master so workers share its memory pages
+# copy-on-write.
+preload_app = True
+
+# Recycle workers gracefully to bound slow memory growth; the jitter keeps
+# them from restarting together.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading must not be shared by workers.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    # Write the token uses this worker has not flushed yet.
+    from core import tokens
+
+    tokens.get_tracker().flush()
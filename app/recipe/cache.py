@@ -0,0 +1,100 @@
+"""
+Per-user cache of recipe API responses.
+
+Every user has a generation counter that is bumped whenever one of their
+recipes changes. Cached payloads are keyed by that generation, so a bump
+makes every older entry unreachable without having to find and delete it.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+HITS_KEY = 'recipe:stats:hits'
+MISSES_KEY = 'recipe:stats:misses'
+
+
+def _cache():
+    return caches[settings.RECIPE_CACHE['CACHE_ALIAS']]
+
+
+def _generation_key(user_id):
+    return f'recipe:gen:{user_id}'
+
+
+def get_generation(user_id):
+    """Return the current cache generation for a user."""
+    cache = _cache()
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Start from the clock so entries of a lost counter never match.
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+
+    return generation
+
+
+def bump_generation(user_id):
+    """Invalidate every cached response of a user."""
+    cache = _cache()
+    key = _generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate(user_id):
+    """Invalidate a user's cached responses now and when the write commits.
+
+    The second bump discards anything a concurrent request cached from
+    data read before the transaction committed.
+    """
+    bump_generation(user_id)
+    transaction.on_commit(lambda: bump_generation(user_id))
+
+
+def response_key(request, kind):
+    """Return the cache key of the response to a request for its user."""
+    generation = get_generation(request.user.pk)
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    # Entries hold the ETag, which depends on the negotiated media type.
+    media_type = request.accepted_renderer.media_type
+
+    return f'recipe:{kind}:{request.user.pk}:{generation}:{url}:{media_type}'
+
+
+def get_response(key):
+    """Return the cached payload for key, counting the hit or miss."""
+    cache = _cache()
+    data = cache.get(key)
+    _count(MISSES_KEY if data is None else HITS_KEY)
+
+    return data
+
+
+def set_response(key, data):
+    """Cache a response payload."""
+    _cache().set(key, data, settings.RECIPE_CACHE['TIMEOUT'])
+
+
+def _count(key):
+    cache = _cache()
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def stats():
+    """Return hit and miss counters for monitoring."""
+    counts = _cache().get_many([HITS_KEY, MISSES_KEY])
+
+    return {
+        'hits': counts.get(HITS_KEY, 0),
+        'misses': counts.get(MISSES_KEY, 0),
+    }
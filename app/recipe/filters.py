@@ -0,0 +1,88 @@
+"""
+Filter backends for the recipe APIs.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class RecipeSearchFilter(BaseFilterBackend):
+    """Full-text search over title and description, best matches first.
+
+    Matches use the GIN index on ``Recipe.search_vector``; title matches
+    rank above description matches. Cursor pagination keeps its own ``-id``
+    order, so paginated results are filtered but not ranked.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter and rank the queryset by the search terms."""
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+
+        query = SearchQuery(terms, config='english', search_type='websearch')
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query),
+        ).order_by('-rank', '-id')
+
+
+class RecipeRangeFilter(BaseFilterBackend):
+    """Filter recipes by ranges of whitelisted numeric fields.
+
+    Accepts ``<field>__lt``, ``__lte``, ``__gt``, ``__gte`` and
+    ``__range=<low>,<high>``, e.g. ``?time_minutes__lte=30``.
+    """
+    range_fields = ['price', 'time_minutes']
+    lookups = ['lt', 'lte', 'gt', 'gte', 'range']
+
+    def filter_queryset(self, request, queryset, view):
+        """Apply every range parameter present in the request."""
+        filters = {}
+        for field_name in self.range_fields:
+            field = queryset.model._meta.get_field(field_name)
+            for lookup in self.lookups:
+                param = f'{field_name}__{lookup}'
+                value = request.query_params.get(param)
+                if value is None:
+                    continue
+
+                values = value.split(',')
+                if (lookup == 'range') != (len(values) == 2):
+                    raise ValidationError({param: ['Invalid value.']})
+                try:
+                    values = [field.to_python(v.strip()) for v in values]
+                except DjangoValidationError as exc:
+                    raise ValidationError({param: exc.messages})
+
+                filters[param] = values if lookup == 'range' else values[0]
+
+        return queryset.filter(**filters)
+
+
+class RecipeOrderingFilter(OrderingFilter):
+    """Ordering by the view's ``ordering_fields``, with ``id`` as tie-breaker.
+
+    The tie-breaker follows the direction of the first field so a single
+    ``(user, <field>, id)`` index serves both directions. Without an
+    ``?ordering=`` parameter the queryset's own order (e.g. search rank)
+    is kept.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        """Return the requested ordering plus the id tie-breaker."""
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or ordering[0].lstrip('-') == 'id':
+            return ordering
+
+        tie_breaker = '-id' if ordering[0].startswith('-') else 'id'
+        return [*ordering, tie_breaker]
+
+    def filter_queryset(self, request, queryset, view):
+        """Order the queryset only when the client asked for an ordering."""
+        if not request.query_params.get(self.ordering_param):
+            return queryset
+
+        return super().filter_queryset(request, queryset, view)
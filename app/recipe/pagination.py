@@ -0,0 +1,33 @@
+"""
+Pagination for the recipe APIs.
+"""
+from django.conf import settings
+
+from rest_framework.pagination import CursorPagination
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Keyset pagination over the user's recipes, newest first.
+
+    The list queryset is already scoped to the user, so seeking on ``id``
+    walks the ``(user_id, -id)`` index instead of using OFFSET. Pagination
+    is opt-in: it only kicks in when the client sends ``cursor`` or
+    ``page_size``, so existing clients keep getting the plain list.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        """Return the page size, or None to leave the list unpaginated."""
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+
+        config = settings.REST_FRAMEWORK
+        self.page_size = config.get('RECIPE_PAGE_SIZE', 100)
+        self.max_page_size = config.get('RECIPE_MAX_PAGE_SIZE', 1000)
+
+        return super().get_page_size(request)
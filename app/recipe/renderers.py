@@ -0,0 +1,55 @@
+"""
+Renderers for exporting recipes.
+
+Besides ``render()`` for whole payloads, each renderer can ``stream()`` an
+iterable of rows so exports never hold more than one row in memory.
+"""
+import csv
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class _Echo:
+    """File-like object that returns what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Render one JSON document per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list as one line per item, anything else as one line."""
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.stream(rows))
+
+    def stream(self, rows, fields=None):
+        """Yield an encoded line per row."""
+        for row in rows:
+            yield (json.dumps(row, cls=JSONEncoder) + '\n').encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """Render rows as CSV with a header line."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list of rows, or a single row such as an error."""
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return b''.join(self.stream(rows, fields))
+
+    def stream(self, rows, fields):
+        """Yield the encoded header followed by a line per row."""
+        writer = csv.DictWriter(_Echo(), fieldnames=fields, extrasaction='ignore')
+        yield writer.writeheader().encode(self.charset)
+        for row in rows:
+            yield writer.writerow(row).encode(self.charset)
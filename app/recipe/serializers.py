@@ -1,12 +1,56 @@
 """
 Serializer for recipe API
 """
+from operator import attrgetter
 
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 
 from core.models import Recipe
 
-class RecipeSerializer(serializers.ModelSerializer):
+
+class RecipeListSerializer(serializers.ListSerializer):
+    """Serializer writing many recipes with batched queries."""
+
+    def create(self, validated_data):
+        """Create all recipes with bulk inserts."""
+        recipes = [Recipe(**attrs) for attrs in validated_data]
+
+        return Recipe.objects.bulk_create(
+            recipes, batch_size=settings.RECIPE_BULK['BATCH_SIZE'],
+        )
+
+    def update(self, instance, validated_data):
+        """Update the recipes in instance, matched to validated_data by position."""
+        now = timezone.now()
+        fields = {'updated_at'}
+        for recipe, attrs in zip(instance, validated_data):
+            for attr, value in attrs.items():
+                setattr(recipe, attr, value)
+            # bulk_update() does not apply auto_now.
+            recipe.updated_at = now
+            fields.update(attrs)
+
+        Recipe.objects.bulk_update(
+            instance, fields, batch_size=settings.RECIPE_BULK['BATCH_SIZE'],
+        )
+        return instance
+
+
+class DynamicFieldsMixin:
+    """Serializer mixin limiting output to the names passed as ``fields``."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class RecipeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for recipe."""
 
     class Meta:
@@ -20,3 +64,50 @@ class RecipeDetailSerializer(RecipeSerializer):
 
     class Meta(RecipeSerializer.Meta):
         fields = RecipeSerializer.Meta.fields + ['description']
+        list_serializer_class = RecipeListSerializer
+
+
+class RecipeValuesSerializer:
+    """Read-only fast path producing the same output as a recipe serializer.
+
+    Rows are fetched with ``values_list()`` and turned into dicts directly,
+    skipping DRF's per-field ``get_attribute``/``to_representation`` calls.
+    Only fields whose representation differs from the database value, such
+    as the Decimal ``price``, go through the wrapped serializer's field.
+    """
+    passthrough_fields = (serializers.CharField, serializers.IntegerField)
+
+    def __init__(self, serializer):
+        self.names = []
+        self.sources = []
+        self.converted = []
+        for name, field in serializer.fields.items():
+            self.names.append(name)
+            self.sources.append(field.source)
+            if type(field) not in self.passthrough_fields:
+                self.converted.append((name, field.to_representation))
+
+    def _to_dict(self, row):
+        data = dict(zip(self.names, row))
+        for name, to_representation in self.converted:
+            value = data[name]
+            if value is not None:
+                data[name] = to_representation(value)
+
+        return data
+
+    def serialize_queryset(self, queryset):
+        """Return the representation of every recipe in queryset."""
+        return [
+            self._to_dict(row)
+            for row in queryset.values_list(*self.sources)
+        ]
+
+    def serialize_instances(self, instances):
+        """Return the representation of already fetched recipes."""
+        if len(self.sources) == 1:
+            getter = lambda instance: (getattr(instance, self.sources[0]),)  # noqa: E731
+        else:
+            getter = attrgetter(*self.sources)
+
+        return [self._to_dict(getter(instance)) for instance in instances]
@@ -0,0 +1,15 @@
+"""
+Signal handlers for the recipe app.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Recipe
+from recipe import cache
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe_cache(sender, instance, **kwargs):
+    """Invalidate the cached responses of the recipe's owner."""
+    cache.invalidate(instance.user_id)
@@ -1,10 +1,18 @@
 """
 Tests for recipe APIs.
 """
+import csv
+import io
+import json
 from decimal import Decimal
+from unittest.mock import patch
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
@@ -15,9 +23,13 @@ from core.models import Recipe
 from recipe.serializers import (
     RecipeSerializer,
     RecipeDetailSerializer,
+    RecipeValuesSerializer,
 )
 
 RECIPES_URL = reverse('recipe:recipe-list')
+CACHE_STATS_URL = reverse('recipe:cache-stats')
+BULK_URL = reverse('recipe:recipe-bulk')
+EXPORT_URL = reverse('recipe:recipe-export')
 
 
 def create_user(**params):
@@ -206,4 +218,690 @@ class PriveRecipeAPITests(TestCase):
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
-        self.assertTrue(Recipe.objects.filter(id = recipe.id).exists())
\ No newline at end of file
+        self.assertTrue(Recipe.objects.filter(id = recipe.id).exists())
+
+class RecipePaginationTests(TestCase):
+    """Test cursor pagination of the recipe list."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+
+    def test_list_unpaginated_by_default(self):
+        """Test the list is a plain array without pagination params."""
+        create_recipe(user=self.user)
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(res.data, list)
+
+    def test_cursor_pages_cover_all_recipes(self):
+        """Test following next cursors walks every recipe once, newest first."""
+        recipes = [create_recipe(user=self.user) for _ in range(5)]
+        create_recipe(user=create_user(email='other@example.com', password='test123'))
+
+        res = self.client.get(RECIPES_URL, {'page_size': 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data['previous'])
+
+        ids = []
+        while True:
+            ids.extend(item['id'] for item in res.data['results'])
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(ids, [r.id for r in reversed(recipes)])
+
+    def test_page_size_capped(self):
+        """Test the requested page size is capped by the settings."""
+        for _ in range(3):
+            create_recipe(user=self.user)
+
+        rest_framework = {**settings.REST_FRAMEWORK, 'RECIPE_MAX_PAGE_SIZE': 2}
+        with self.settings(REST_FRAMEWORK=rest_framework):
+            res = self.client.get(RECIPES_URL, {'page_size': 50})
+
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertIsNotNone(res.data['next'])
+
+    def test_invalid_cursor(self):
+        """Test a tampered cursor returns 404."""
+        res = self.client.get(RECIPES_URL, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RecipeCacheTests(TestCase):
+    """Test the per-user recipe response cache."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+
+    def test_repeat_list_served_from_cache(self):
+        """Test a repeated list request runs no queries."""
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(RECIPES_URL)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.data, res.data)
+
+    def test_repeat_detail_served_from_cache(self):
+        """Test a repeated detail request runs no queries."""
+        recipe = create_recipe(user=self.user)
+        res = self.client.get(detail_url(recipe.id))
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(detail_url(recipe.id))
+
+        self.assertEqual(cached.data, res.data)
+
+    def test_writes_invalidate_cache(self):
+        """Test creating, updating and deleting refresh the cached list."""
+        recipe = create_recipe(user=self.user)
+        self.client.get(RECIPES_URL)
+
+        self.client.post(RECIPES_URL, {
+            'title': 'New recipe', 'time_minutes': 5, 'price': '1.00',
+        })
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(len(res.data), 2)
+
+        self.client.patch(detail_url(recipe.id), {'title': 'Changed'})
+        res = self.client.get(detail_url(recipe.id))
+        self.assertEqual(res.data['title'], 'Changed')
+
+        self.client.delete(detail_url(recipe.id))
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(len(res.data), 1)
+
+    def test_cache_not_shared_between_users(self):
+        """Test a user never gets another user's cached list."""
+        other = create_user(email='other@example.com', password='test123')
+        create_recipe(user=other)
+        self.client.get(RECIPES_URL)
+
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+        res = other_client.get(RECIPES_URL)
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_cache_stats(self):
+        """Test hit and miss counters are reported to admins only."""
+        self.client.get(RECIPES_URL)
+        self.client.get(RECIPES_URL)
+
+        res = self.client.get(CACHE_STATS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.data, {'hits': 1, 'misses': 1})
+
+
+class RecipeConditionalGetTests(TestCase):
+    """Test ETag and Last-Modified handling of the recipe APIs."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+
+    def test_list_not_modified(self):
+        """Test a list request with a current ETag returns 304."""
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+        self.assertIn('ETag', res)
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+
+    def test_list_etag_changes_on_write(self):
+        """Test updating or deleting a recipe changes the list ETag."""
+        recipe = create_recipe(user=self.user)
+        other = create_recipe(user=self.user)
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        recipe.title = 'Changed'
+        recipe.save()
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+        etag = res['ETag']
+        other.delete()
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def test_list_etag_validated_without_cache(self):
+        """Test the ETag is recomputed from the data when not cached."""
+        create_recipe(user=self.user)
+        etag = self.client.get(RECIPES_URL)['ETag']
+        caches['default'].clear()
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_not_modified(self):
+        """Test detail requests honour If-None-Match and If-Modified-Since."""
+        recipe = create_recipe(user=self.user)
+        url = detail_url(recipe.id)
+        res = self.client.get(url)
+
+        by_etag = self.client.get(url, HTTP_IF_NONE_MATCH=res['ETag'])
+        by_date = self.client.get(url, HTTP_IF_MODIFIED_SINCE=res['Last-Modified'])
+
+        self.assertEqual(by_etag.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(by_date.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_differs_between_users(self):
+        """Test another user's ETag never matches."""
+        create_recipe(user=self.user)
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        other_client = APIClient()
+        other_client.force_authenticate(
+            create_user(email='other@example.com', password='test123')
+        )
+        res = other_client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_etag_differs_between_media_types(self):
+        """Test the JSON ETag does not validate the browsable API."""
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+        self.assertIn('Accept', res['Vary'])
+
+        res = self.client.get(
+            RECIPES_URL, HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=res['ETag'],
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/html; charset=utf-8')
+
+    def test_detail_missing_recipe(self):
+        """Test a missing recipe still returns 404."""
+        res = self.client.get(detail_url(0), HTTP_IF_NONE_MATCH='"x"')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RecipeBulkAPITests(TestCase):
+    """Test the recipe bulk endpoint."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create(self):
+        """Test creating many recipes with one insert."""
+        payload = [
+            {'title': f'Recipe {i}', 'time_minutes': i, 'price': '1.50'}
+            for i in range(3)
+        ]
+
+        with self.assertNumQueries(3):  # savepoint, insert, release
+            res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['title'] for item in res.data], [
+            'Recipe 0', 'Recipe 1', 'Recipe 2',
+        ])
+        recipes = Recipe.objects.filter(user=self.user)
+        self.assertEqual(recipes.count(), 3)
+        self.assertEqual(
+            sorted(recipes.values_list('id', flat=True)),
+            sorted(item['id'] for item in res.data),
+        )
+
+    def test_bulk_create_invalid_item_rolls_back(self):
+        """Test one invalid item rejects the batch with per-item errors."""
+        payload = [
+            {'title': 'Good', 'time_minutes': 5, 'price': '1.50'},
+            {'title': 'Bad', 'price': '1.50'},
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('time_minutes', res.data[1])
+        self.assertFalse(Recipe.objects.filter(user=self.user).exists())
+
+    def test_bulk_update(self):
+        """Test partially updating many recipes."""
+        first = create_recipe(user=self.user, title='First')
+        second = create_recipe(user=self.user, title='Second')
+        original_updated_at = second.updated_at
+        payload = [
+            {'id': first.id, 'title': 'First updated'},
+            {'id': second.id, 'price': '9.99'},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.title, 'First updated')
+        self.assertEqual(second.title, 'Second')
+        self.assertEqual(second.price, Decimal('9.99'))
+        self.assertGreater(second.updated_at, original_updated_at)
+
+    def test_bulk_update_other_user_recipe_error(self):
+        """Test updating another user's recipe fails for that item."""
+        mine = create_recipe(user=self.user)
+        other = create_recipe(
+            user=create_user(email='other@example.com', password='test123'),
+        )
+        payload = [
+            {'id': mine.id, 'title': 'Changed'},
+            {'id': other.id, 'title': 'Changed'},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[1], {'id': ['Not found.']})
+        other.refresh_from_db()
+        self.assertNotEqual(other.title, 'Changed')
+
+    def test_bulk_invalid_ids(self):
+        """Test ids that are not integers are rejected per item."""
+        recipe = create_recipe(user=self.user)
+
+        res = self.client.patch(
+            BULK_URL, [{'id': [recipe.id]}, {'id': True}, {'id': recipe.id}], format='json',
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {'id': ['Invalid id.']})
+        self.assertEqual(res.data[1], {'id': ['Invalid id.']})
+        self.assertEqual(res.data[2], {})
+
+        res = self.client.delete(BULK_URL, [[recipe.id], '1'], format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Recipe.objects.filter(id=recipe.id).exists())
+
+    def test_bulk_delete(self):
+        """Test deleting many recipes."""
+        recipes = [create_recipe(user=self.user) for _ in range(2)]
+        kept = create_recipe(user=self.user)
+
+        res = self.client.delete(
+            BULK_URL, [r.id for r in recipes], format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(Recipe.objects.filter(user=self.user)), [kept],
+        )
+
+    def test_bulk_delete_invalidates_cache(self):
+        """Test a bulk delete refreshes the cached list."""
+        recipes = [create_recipe(user=self.user) for _ in range(3)]
+        self.assertEqual(len(self.client.get(RECIPES_URL).data), 3)
+
+        self.client.delete(BULK_URL, [r.id for r in recipes], format='json')
+
+        self.assertEqual(len(self.client.get(RECIPES_URL).data), 0)
+        self.assertFalse(Recipe.objects.filter(user=self.user).exists())
+
+    def test_bulk_invalidates_cache(self):
+        """Test bulk writes refresh the cached list."""
+        self.client.get(RECIPES_URL)
+
+        self.client.post(BULK_URL, [
+            {'title': 'New', 'time_minutes': 5, 'price': '1.50'},
+        ], format='json')
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_bulk_requires_list(self):
+        """Test a non-list payload is rejected."""
+        res = self.client.post(BULK_URL, {'title': 'x'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RecipeExportAPITests(TestCase):
+    """Test the streaming recipe export."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+
+    def test_export_ndjson(self):
+        """Test exporting recipes as one JSON object per line."""
+        recipes = [create_recipe(user=self.user) for _ in range(3)]
+        create_recipe(user=create_user(email='other@example.com', password='test123'))
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertTrue(res['Content-Type'].startswith('application/x-ndjson'))
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        expected = RecipeDetailSerializer(reversed(recipes), many=True).data
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+    def test_export_csv(self):
+        """Test exporting recipes as CSV."""
+        recipe = create_recipe(user=self.user, title='Soup, hot')
+
+        res = self.client.get(EXPORT_URL, {'format': 'csv'})
+
+        self.assertTrue(res['Content-Type'].startswith('text/csv'))
+        content = b''.join(res.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['id'], str(recipe.id))
+        self.assertEqual(rows[0]['title'], 'Soup, hot')
+        self.assertEqual(rows[0]['price'], '5.25')
+
+    def test_export_auth_required(self):
+        """Test the export requires authentication."""
+        res = APIClient().get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class RecipeSearchAPITests(TestCase):
+    """Test full-text search of recipes."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+
+    def test_search_title_and_description(self):
+        """Test matching recipes are returned, title matches first."""
+        in_description = create_recipe(
+            user=self.user, title='Stew', description='Slow cooked with tomatoes',
+        )
+        in_title = create_recipe(
+            user=self.user, title='Tomato soup', description='Warm',
+        )
+        create_recipe(user=self.user, title='Pancakes', description='Sweet')
+
+        res = self.client.get(RECIPES_URL, {'search': 'tomato'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in res.data],
+            [in_title.id, in_description.id],
+        )
+
+    def test_search_updates_with_recipe(self):
+        """Test the search index follows edits, including bulk ones."""
+        recipe = create_recipe(user=self.user, title='Pancakes')
+        self.client.patch(detail_url(recipe.id), {'title': 'Waffles'})
+        self.client.post(BULK_URL, [
+            {'title': 'Belgian waffles', 'time_minutes': 5, 'price': '1.00'},
+        ], format='json')
+
+        res = self.client.get(RECIPES_URL, {'search': 'waffles'})
+
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(self.client.get(RECIPES_URL, {'search': 'pancakes'}).data, [])
+
+    def test_search_limited_to_user(self):
+        """Test other users' recipes are never matched."""
+        create_recipe(
+            user=create_user(email='other@example.com', password='test123'),
+            title='Tomato soup',
+        )
+
+        res = self.client.get(RECIPES_URL, {'search': 'tomato'})
+
+        self.assertEqual(res.data, [])
+
+
+class RecipeFilterAPITests(TestCase):
+    """Test filtering and ordering the recipe list."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+
+    def test_filter_time_minutes(self):
+        """Test filtering recipes by maximum preparation time."""
+        quick = create_recipe(user=self.user, time_minutes=30)
+        create_recipe(user=self.user, time_minutes=31)
+
+        res = self.client.get(RECIPES_URL, {'time_minutes__lte': 30})
+
+        self.assertEqual([item['id'] for item in res.data], [quick.id])
+
+    def test_filter_price_range(self):
+        """Test filtering recipes by a price range."""
+        create_recipe(user=self.user, price=Decimal('1.00'))
+        mid = create_recipe(user=self.user, price=Decimal('5.00'))
+        create_recipe(user=self.user, price=Decimal('9.00'))
+
+        res = self.client.get(RECIPES_URL, {'price__range': '2,6'})
+
+        self.assertEqual([item['id'] for item in res.data], [mid.id])
+
+    def test_filter_invalid_value(self):
+        """Test an invalid filter value returns 400."""
+        for params in ({'price__lte': 'cheap'}, {'price__range': '1'}):
+            res = self.client.get(RECIPES_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering(self):
+        """Test ordering by price, with ties broken by id."""
+        a = create_recipe(user=self.user, price=Decimal('3.00'))
+        b = create_recipe(user=self.user, price=Decimal('1.00'))
+        c = create_recipe(user=self.user, price=Decimal('3.00'))
+
+        res = self.client.get(RECIPES_URL, {'ordering': 'price'})
+        self.assertEqual([item['id'] for item in res.data], [b.id, a.id, c.id])
+
+        res = self.client.get(RECIPES_URL, {'ordering': '-price'})
+        self.assertEqual([item['id'] for item in res.data], [c.id, a.id, b.id])
+
+    def test_ordering_not_whitelisted_ignored(self):
+        """Test ordering on other fields falls back to newest first."""
+        first = create_recipe(user=self.user, description='b')
+        second = create_recipe(user=self.user, description='a')
+
+        res = self.client.get(RECIPES_URL, {'ordering': 'description'})
+
+        self.assertEqual([item['id'] for item in res.data], [second.id, first.id])
+
+    def test_ordering_with_cursor_pagination(self):
+        """Test cursor pages follow the requested ordering."""
+        recipes = [
+            create_recipe(user=self.user, title=title)
+            for title in ['d', 'b', 'e', 'a', 'c']
+        ]
+
+        res = self.client.get(RECIPES_URL, {'ordering': 'title', 'page_size': 2})
+        titles = []
+        while True:
+            titles.extend(item['title'] for item in res.data['results'])
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(titles, sorted(r.title for r in recipes))
+
+
+class RecipeSparseFieldsetTests(TestCase):
+    """Test limiting recipe responses with ?fields=."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+
+    def test_list_fields(self):
+        """Test the list only returns and fetches the requested fields."""
+        recipe = create_recipe(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL, {'fields': 'id,title'})
+
+        self.assertEqual(res.data, [{'id': recipe.id, 'title': recipe.title}])
+        self.assertFalse(any('"price"' in q['sql'] for q in queries))
+
+    def test_list_never_fetches_description(self):
+        """Test the plain list does not read the description column."""
+        create_recipe(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(RECIPES_URL)
+
+        self.assertFalse(any('"description"' in q['sql'] for q in queries))
+
+    def test_detail_fields(self):
+        """Test the detail view honours ?fields=."""
+        recipe = create_recipe(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(detail_url(recipe.id), {'fields': 'title,price'})
+
+        self.assertEqual(res.data, {'title': recipe.title, 'price': '5.25'})
+        self.assertFalse(any('"description"' in q['sql'] for q in queries))
+
+    def test_unknown_field(self):
+        """Test requesting an unknown field returns 400."""
+        res = self.client.get(RECIPES_URL, {'fields': 'id,description'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_updates_unaffected(self):
+        """Test ?fields= does not limit the fields accepted on writes."""
+        recipe = create_recipe(user=self.user)
+
+        res = self.client.patch(
+            detail_url(recipe.id) + '?fields=id', {'title': 'Changed'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.title, 'Changed')
+
+
+class RecipeFastListTests(TestCase):
+    """Test the fast list serializer matches RecipeSerializer."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.client.force_authenticate(self.user)
+        for i in range(3):
+            create_recipe(
+                user=self.user,
+                title=f'Tomato {i}',
+                price=Decimal('10') / (i + 3),
+                link='',
+            )
+
+    def test_output_identical(self):
+        """Test fast and DRF lists render to the same bytes."""
+        variants = [
+            {},
+            {'fields': 'id,price'},
+            {'page_size': 2},
+            {'search': 'tomato', 'ordering': '-price'},
+        ]
+        for params in variants:
+            with self.subTest(params=params):
+                fast = self.client.get(RECIPES_URL, params)
+                caches['default'].clear()
+                with self.settings(RECIPE_FAST_LIST=False):
+                    slow = self.client.get(RECIPES_URL, params)
+                caches['default'].clear()
+
+                self.assertEqual(fast.status_code, status.HTTP_200_OK)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_serialize_queryset(self):
+        """Test serializing a queryset directly."""
+        queryset = Recipe.objects.filter(user=self.user).order_by('-id')
+
+        data = RecipeValuesSerializer(RecipeSerializer()).serialize_queryset(queryset)
+
+        self.assertEqual(data, RecipeSerializer(queryset, many=True).data)
+
+
+class RecipePoolerTests(TestCase):
+    """Test the API works behind a transaction-mode pooler."""
+
+    def setUp(self):
+        caches['default'].clear()
+        patcher = patch.dict(connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.create_cursor = patch.object(
+            connection, 'create_cursor', wraps=connection.create_cursor,
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def assertNoServerSideCursors(self):
+        names = [
+            call.args[0] if call.args else call.kwargs.get('name')
+            for call in self.create_cursor.call_args_list
+        ]
+        self.assertTrue(names)
+        self.assertEqual(set(names), {None})
+
+    def test_export_in_chunks(self):
+        """Test exports read keyset chunks instead of a server-side cursor."""
+        user = create_user(email='user@example.com', password='test123')
+        recipes = [create_recipe(user=user) for _ in range(5)]
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with self.settings(RECIPE_EXPORT_CHUNK_SIZE=2), self.assertNumQueries(3):
+            res = client.get(EXPORT_URL)
+            lines = b''.join(res.streaming_content).decode().splitlines()
+
+        self.assertEqual(
+            [json.loads(line)['id'] for line in lines],
+            [recipe.id for recipe in reversed(recipes)],
+        )
+        self.assertNoServerSideCursors()
+
+    def test_token_auth_and_recipe_flow(self):
+        """Test signing up, getting a token and managing recipes."""
+        client = APIClient()
+        payload = {'email': 'user@example.com', 'password': 'test123', 'name': 'Test'}
+        client.post(reverse('user:create'), payload)
+        res = client.post(reverse('user:token'), payload)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {res.data['token']}")
+
+        res = client.post(RECIPES_URL, {'title': 'Soup', 'time_minutes': 5, 'price': '1.00'})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        res = client.patch(BULK_URL, [{'id': res.data['id'], 'title': 'Stew'}], format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([recipe['title'] for recipe in res.data], ['Stew'])
+        self.assertNoServerSideCursors()
@@ -9,6 +9,7 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
+from core.async_views import async_read_urls
 from recipe import views
 
 router = DefaultRouter()
@@ -17,5 +18,6 @@ router.register('recipes', views.RecipeViewSet) # here it will automatically ass
 app_name = 'recipe'
 
 urlpatterns = [
-    path('', include(router.urls)),
+    path('', include(async_read_urls(router.urls))),
+    path('cache-stats/', views.RecipeCacheStatsView.as_view(), name='cache-stats'),
 ]
\ No newline at end of file
@@ -1,26 +1,53 @@
 """
 Views for recipe APis.
 """
+from django.conf import settings
+from django.db import connections, transaction
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import status, viewsets, views
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
 
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
-
+from core.authentication import CachedTokenAuthentication
 from core.models import Recipe
-from recipe import serializers
+from core.routers import ReplicaReadMixin
+from core.signed_tokens import SignedTokenAuthentication
+from recipe import cache, conditional, renderers, serializers
+from recipe.filters import (
+    RecipeOrderingFilter,
+    RecipeRangeFilter,
+    RecipeSearchFilter,
+)
+from recipe.pagination import RecipeCursorPagination
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """View for mange recipe Apis."""
 
     serializer_class = serializers.RecipeDetailSerializer
     queryset = Recipe.objects.all()
 
-    authentication_classes  = [TokenAuthentication]
+    authentication_classes  = [CachedTokenAuthentication, SignedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipeCursorPagination
+    filter_backends = [RecipeSearchFilter, RecipeRangeFilter, RecipeOrderingFilter]
+    ordering_fields = ['price', 'time_minutes', 'title']
+    ordering = '-id'
+    replica_actions = ('list', 'retrieve')
 
     def get_queryset(self):
         """Retrieve recipes for authenticated user."""
-        return self.queryset.filter(user = self.request.user).order_by('-id')
+        queryset = self.queryset.filter(user = self.request.user).order_by('-id')
+
+        if self.action in ('list', 'retrieve', 'export'):
+            # Read-only actions fetch just the columns they serialize.
+            fields = self.get_requested_fields() or self.get_serializer_class().Meta.fields
+            return queryset.only(*fields)
+
+        return queryset.defer('search_vector')
 
     def get_serializer_class(self):
         """Return the serializer class for request"""
@@ -29,6 +56,217 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
         return self.serializer_class
 
+    def get_serializer(self, *args, **kwargs):
+        """Return the serializer, limited to ``?fields=`` on reads."""
+        if self.action in ('list', 'retrieve'):
+            kwargs.setdefault('fields', self.get_requested_fields())
+
+        return super().get_serializer(*args, **kwargs)
+
+    def get_requested_fields(self):
+        """Return the field names given in ``?fields=``, or None for all."""
+        param = self.request.query_params.get('fields')
+        if not param:
+            return None
+
+        requested = [name.strip() for name in param.split(',') if name.strip()]
+        available = self.get_serializer_class().Meta.fields
+        unknown = [name for name in requested if name not in available]
+        if unknown:
+            raise ValidationError({
+                'fields': [f"Unknown field(s): {', '.join(unknown)}."],
+            })
+
+        return requested
+
     def perform_create(self, serializer):
         """Create a new recipe"""
         serializer.save(user = self.request.user)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """Create, update or delete many recipes in one transaction.
+
+        POST takes a list of recipes, PATCH a list of partial recipes with
+        their ``id`` and DELETE a list of ids. Results and validation errors
+        are returned per item, in the order of the payload.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+
+        max_items = settings.RECIPE_BULK['MAX_ITEMS']
+        if len(items) > max_items:
+            raise ValidationError({
+                'non_field_errors': [f'Ensure there are at most {max_items} items.'],
+            })
+
+        with transaction.atomic():
+            if request.method == 'POST':
+                serializer = self.get_serializer(data=items, many=True)
+                serializer.is_valid(raise_exception=True)
+                serializer.save(user=request.user)
+                response = Response(serializer.data, status=status.HTTP_201_CREATED)
+            else:
+                ids = [
+                    item.get('id') if isinstance(item, dict) else item
+                    for item in items
+                ]
+                recipes = self._get_bulk_objects(ids)
+                if request.method == 'PATCH':
+                    serializer = self.get_serializer(
+                        recipes, data=items, many=True, partial=True,
+                    )
+                    serializer.is_valid(raise_exception=True)
+                    serializer.save()
+                    response = Response(serializer.data)
+                else:
+                    self.get_queryset().filter(pk__in=ids).delete()
+                    response = Response([{'id': pk} for pk in ids])
+
+        # bulk_create() and bulk_update() send no model signals.
+        cache.invalidate(request.user.pk)
+
+        return response
+
+    @action(
+        detail=False,
+        methods=['get'],
+        renderer_classes=[renderers.NDJSONRenderer, renderers.CSVRenderer],
+    )
+    def export(self, request):
+        """Stream all of the user's recipes as NDJSON or CSV.
+
+        The format is negotiated from the Accept header or ``?format=``.
+        Rows are read in chunks and written as they are serialized, so
+        memory use does not grow with the number of recipes.
+        """
+        renderer = request.accepted_renderer
+        serializer = serializers.RecipeDetailSerializer(
+            fields=self.get_requested_fields(),
+        )
+        recipes = self._iterate_in_chunks(
+            self.get_queryset(), settings.RECIPE_EXPORT_CHUNK_SIZE,
+        )
+        rows = (serializer.to_representation(recipe) for recipe in recipes)
+
+        response = StreamingHttpResponse(
+            renderer.stream(rows, list(serializer.fields)),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="recipes.{renderer.format}"'
+        )
+        return response
+
+    @staticmethod
+    def _iterate_in_chunks(queryset, chunk_size):
+        """Yield recipes newest first, reading chunk_size rows at a time.
+
+        Server-side cursors are used when available. Behind a transaction
+        pooler they are disabled, and without one psycopg2 would fetch every
+        row at once, so chunks are read with keyset pagination on id instead.
+        """
+        queryset = queryset.order_by('-id')
+        if not connections[queryset.db].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+            yield from queryset.iterator(chunk_size=chunk_size)
+            return
+
+        chunk = list(queryset[:chunk_size])
+        while chunk:
+            yield from chunk
+            if len(chunk) < chunk_size:
+                return
+            chunk = list(queryset.filter(id__lt=chunk[-1].id)[:chunk_size])
+
+    def _get_bulk_objects(self, ids):
+        """Return the user's recipes for ids, in order, or raise per-item errors."""
+        # Only real ints: lists are unhashable and True would mean pk 1.
+        recipes = self.get_queryset().in_bulk(
+            [pk for pk in ids if type(pk) is int]
+        )
+
+        errors = []
+        seen = set()
+        for pk in ids:
+            if type(pk) is not int:
+                errors.append({'id': ['Invalid id.']})
+                continue
+            if pk in seen:
+                errors.append({'id': ['Duplicate id.']})
+            elif pk not in recipes:
+                errors.append({'id': ['Not found.']})
+            else:
+                errors.append({})
+            seen.add(pk)
+
+        if any(errors):
+            raise ValidationError(errors)
+
+        return [recipes[pk] for pk in ids]
+
+    def list(self, request, *args, **kwargs):
+        """List recipes, from the per-user cache when possible."""
+        return self._cached_response('list', self._list, request, *args, **kwargs)
+
+    def _list(self, request, *args, **kwargs):
+        """List recipes, bypassing DRF field machinery when enabled."""
+        if not settings.RECIPE_FAST_LIST:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = serializers.RecipeValuesSerializer(self.get_serializer())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize_instances(page))
+
+        return Response(serializer.serialize_queryset(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a recipe, from the per-user cache when possible."""
+        return self._cached_response('detail', super().retrieve, request, *args, **kwargs)
+
+    def _get_validators(self, kind):
+        """Return the ETag and Last-Modified of the requested recipes."""
+        queryset = self.get_queryset()
+        if kind == 'list':
+            return conditional.list_validators(self.request, queryset)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return conditional.detail_validators(
+            self.request, queryset, self.kwargs[lookup_url_kwarg],
+        )
+
+    def _cached_response(self, kind, handler, request, *args, **kwargs):
+        key = cache.response_key(request, kind)
+        entry = cache.get_response(key)
+        if entry is not None:
+            data, etag, last_modified = entry
+        else:
+            etag, last_modified = self._get_validators(kind)
+
+        # Deletions do not advance Last-Modified of a list, so lists are
+        # only revalidated by ETag.
+        response = conditional.not_modified_response(
+            request, etag, last_modified if kind == 'detail' else None,
+        )
+        if response is None and entry is not None:
+            response = Response(data)
+        elif response is None:
+            response = handler(request, *args, **kwargs)
+            cache.set_response(key, (response.data, etag, last_modified))
+
+        return conditional.set_validator_headers(response, etag, last_modified)
+
+
+class RecipeCacheStatsView(views.APIView):
+    """Report hit and miss counts of the recipe response cache."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        """Return the cache counters."""
+        return Response(cache.stats())
@@ -1,12 +1,11 @@
 """
 Serializers for the user API view.
 """
-from django.contrib.auth import (
-    get_user_model,
-    authenticate,
-    )
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
+
+from core import hashing, signed_tokens
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for the user object."""
@@ -18,7 +17,14 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Create and return a user with encrypted password."""
-        return get_user_model().objects.create_user(**validated_data)
+        # Hash in the hashing pool rather than in create_user().
+        manager = get_user_model().objects
+        password = hashing.make_password(validated_data.pop('password'))
+        email = manager.normalize_email(validated_data.pop('email'))
+        user = manager.model(email=email, password=password, **validated_data)
+        user.save(using=manager.db)
+
+        return user
 
     def update(self,instance, validated_data):
         """Update and return user"""
@@ -26,7 +32,7 @@ class UserSerializer(serializers.ModelSerializer):
         user = super().update(instance ,validated_data)
 
         if password:
-            user.set_password(password)
+            user.password = hashing.make_password(password)
             user.save()
 
         return user
@@ -43,9 +49,9 @@ class AuthTokenSerializer(serializers.Serializer):
         """Validate and autheticate the user."""
         email  = attrs.get('email')
         password = attrs.get('password')
-        user = authenticate(
+        user = hashing.authenticate(
             request= self.context.get("request"),
-            username = email,
+            email = email,
             password = password,
         )
         if not user:
@@ -56,6 +62,20 @@ class AuthTokenSerializer(serializers.Serializer):
         return attrs
 
 
+class RefreshTokenSerializer(serializers.Serializer):
+    """Serializer for exchanging a signed refresh token."""
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        """Validate the refresh token and return its user."""
+        try:
+            attrs['user'] = signed_tokens.verify_refresh(attrs['refresh'])
+        except exceptions.AuthenticationFailed as exc:
+            raise serializers.ValidationError(exc.detail, code='authorization')
+
+        return attrs
+
+
 
 
 # In Django, a serializer is a crucial component of the Django REST Framework (DRF) that converts complex data types, such as querysets and
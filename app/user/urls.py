@@ -3,6 +3,7 @@ URL mapping for the user API.
 """
 from django.urls import path
 
+from core.async_views import async_read_view
 from user import views
 
 app_name = 'user'
@@ -10,6 +11,7 @@ app_name = 'user'
 urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
     path('token/', views.CreateTokenView.as_view(), name='token'),
-    path("me/", views.ManageUserView.as_view(), name = "me"),
+    path('token/refresh/', views.RefreshTokenView.as_view(), name='token-refresh'),
+    path("me/", async_read_view(views.ManageUserView.as_view()), name = "me"),
 ]
 
@@ -1,27 +1,77 @@
 """
 Views for the user API.
 """
-from rest_framework import generics, authentication, permissions
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import Http404
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
-from user.serializers import UserSerializer, AuthTokenSerializer
+from core import signed_tokens, tokens
+from core.authentication import CachedTokenAuthentication
+from core.metrics import LatencyMetricsMixin
+from core.routers import ReplicaReadMixin
+from core.signed_tokens import SignedTokenAuthentication
+from core.throttling import EmailRateThrottle, IPRateThrottle
+from user.serializers import UserSerializer, AuthTokenSerializer, RefreshTokenSerializer
 
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(LatencyMetricsMixin, generics.CreateAPIView):
     """Create a new user in the system."""
     serializer_class = UserSerializer
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = 'signup'
 
-class CreateTokenView(ObtainAuthToken):
+class CreateTokenView(LatencyMetricsMixin, ObtainAuthToken):
     """Create a new auth token for user"""
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = 'login'
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+    def post(self, request, *args, **kwargs):
+        """Return the user's token, rotating it if it has expired.
+
+        With SIGNED_TOKENS enabled, return signed access and refresh tokens.
+        """
+        serializer = self.serializer_class(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data['user']
+        if settings.SIGNED_TOKENS['ENABLED']:
+            return Response(signed_tokens.issue(user))
+
+        token = tokens.issue(user)
+        return Response({'token': token.key})
+
+class RefreshTokenView(LatencyMetricsMixin, generics.GenericAPIView):
+    """Exchange a signed refresh token for new signed tokens"""
+    serializer_class = RefreshTokenSerializer
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = 'refresh'
+
+    def post(self, request, *args, **kwargs):
+        if not settings.SIGNED_TOKENS['ENABLED']:
+            raise Http404()
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(signed_tokens.issue(serializer.validated_data['user']))
+
+class ManageUserView(ReplicaReadMixin, generics.RetrieveUpdateAPIView):
     """Manage the authenticated user"""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication, ]
+    authentication_classes = [CachedTokenAuthentication, SignedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
         """Retrieve and return the authenticated user."""
+        if self.request.user._state.adding:
+            # Signed tokens only carry the user id.
+            return generics.get_object_or_404(
+                get_user_model(), pk=self.request.user.pk, is_active=True,
+            )
         return self.request.user
\ No newline at end of file
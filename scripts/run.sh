@@ -0,0 +1,23 @@
+#!/bin/sh
+
+set -e
+
+# Response caches, read-your-writes pins and token invalidation live in
+# CACHES['default'], which must be shared when gunicorn runs several workers.
+if [ "${WEB_CONCURRENCY:-0}" != 1 ]; then
+    case "${CACHE_BACKEND:-locmem}" in
+        *locmem*)
+            echo "CACHE_BACKEND must name a shared cache (e.g. memcached) when" \
+                "running several workers; set it, or set WEB_CONCURRENCY=1." >&2
+            exit 1
+            ;;
+    esac
+fi
+
+python manage.py wait_for_db --timeout 60
+python manage.py migrate
+if [ -n "$API_SCHEMA_DIR" ]; then
+    python manage.py generate_schema
+fi
+
+exec gunicorn app.wsgi:application